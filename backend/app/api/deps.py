@@ -7,7 +7,8 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.core.config import Settings, get_settings
-from app.core.database import get_database
+from app.core.database import get_analytics_database, get_database
+from app.core.revocation import revocation_list
 from app.core.security import decode_token
 from app.models.group import GroupInDB
 from app.repositories.group_repository import GroupRepository
@@ -21,6 +22,7 @@ security = HTTPBearer(auto_error=False)
 # Type aliases for cleaner dependency injection
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 DatabaseDep = Annotated[AsyncIOMotorDatabase, Depends(get_database)]
+AnalyticsDatabaseDep = Annotated[AsyncIOMotorDatabase, Depends(get_analytics_database)]
 
 
 def get_group_repository(db: DatabaseDep) -> GroupRepository:
@@ -46,8 +48,33 @@ def get_expense_repository(db: DatabaseDep):
     return ExpenseRepository(db)
 
 
+def get_stats_service(db: AnalyticsDatabaseDep):
+    from app.services.stats_service import StatsService
+    return StatsService(db)
+
+
+def get_export_service(db: AnalyticsDatabaseDep):
+    from app.services.export_service import ExpenseExportService
+    return ExpenseExportService(db)
+
+
+def get_changes_service(db: DatabaseDep):
+    # Primary reads: a lagging secondary could hide writes the token has moved past
+    from app.services.changes_service import ChangesService
+    return ChangesService(db)
+
+
+def get_settlement_service(db: DatabaseDep):
+    from app.services.settlement_service import SettlementService
+    return SettlementService(db)
+
+
 ExpenseServiceDep = Annotated[object, Depends(get_expense_service)]
 ExpenseRepositoryDep = Annotated[object, Depends(get_expense_repository)]
+StatsServiceDep = Annotated[object, Depends(get_stats_service)]
+ExportServiceDep = Annotated[object, Depends(get_export_service)]
+SettlementServiceDep = Annotated[object, Depends(get_settlement_service)]
+ChangesServiceDep = Annotated[object, Depends(get_changes_service)]
 
 
 async def get_current_user_id(
@@ -62,7 +89,11 @@ async def get_current_user_id(
             headers={"WWW-Authenticate": "Bearer"},
         )
     payload = decode_token(credentials.credentials)
-    if payload is None or payload.get("type") != "access":
+    if (
+        payload is None
+        or payload.get("type") != "access"
+        or ("sid" in payload and revocation_list.is_revoked(payload["sid"]))
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
@@ -1,6 +1,6 @@
 """Authentication routes."""
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 from pydantic import BaseModel, EmailStr
 
 from app.api.deps import AuthServiceDep, CurrentUserIdDep, UserRepositoryDep
@@ -36,7 +36,7 @@ async def login(login_data: LoginRequest, auth: AuthServiceDep) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
-    access_token, refresh_token = auth.create_tokens(str(user.id))
+    access_token, refresh_token = await auth.create_tokens(str(user.id))
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -47,13 +47,20 @@ async def login(login_data: LoginRequest, auth: AuthServiceDep) -> dict:
 
 @router.post("/refresh")
 async def refresh_token(refresh_data: RefreshRequest, auth: AuthServiceDep) -> dict:
-    access_token = auth.refresh_access_token(refresh_data.refresh_token)
-    if not access_token:
+    tokens = await auth.refresh_tokens(refresh_data.refresh_token)
+    if not tokens:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
         )
-    return {"access_token": access_token, "token_type": "bearer"}
+    access_token, refresh_token = tokens
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_data: RefreshRequest, auth: AuthServiceDep) -> Response:
+    await auth.logout(refresh_data.refresh_token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get("/me", response_model=User)
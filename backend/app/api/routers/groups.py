@@ -1,25 +1,46 @@
 """Group management and expense routes."""
 
-from fastapi import APIRouter, HTTPException, Query, status
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.api.deps import (
+    ChangesServiceDep,
     CurrentUserIdDep,
-    DatabaseDep,
     ExpenseRepositoryDep,
     ExpenseServiceDep,
+    ExportServiceDep,
     GroupAdminDep,
     GroupMemberDep,
     GroupRepositoryDep,
     GroupServiceDep,
+    SettlementServiceDep,
+    StatsServiceDep,
     UserRepositoryDep,
 )
+from app.core.database import analytics_reads_primary
+from app.core.events import event_broker, sse_stream
+from app.core.fx import MissingRateError
+from app.core.money import from_minor, to_minor
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.response_cache import response_cache
+from app.core.responses import ORJSONResponse
 from app.models.expense import (
     PREDEFINED_CATEGORIES,
     Expense,
     ExpenseCreate,
+    ExpenseInDB,
+    expense_to_json,
 )
-from app.models.group import Group, GroupCreate, MemberRole
+from app.models.group import CURRENCY_PATTERN, Group, GroupCreate, MemberRole
+from app.models.settlement import Settlement, SettlementCreate
+from app.services.changes_service import sync_token
+from app.services.expense_service import BULK_MAX_BODY_BYTES, BULK_MAX_ROWS
 
 router = APIRouter(prefix="/groups", tags=["Groups"])
 
@@ -30,6 +51,77 @@ class AddMemberRequest(BaseModel):
     user_id: str = Field(..., description="User ID to add")
 
 
+# ---- Helpers ----
+
+async def _read_capped_body(request: Request, limit: int) -> bytes:
+    """Request body, or 413 as soon as it is known to exceed `limit` bytes."""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Body larger than {limit} bytes; import at most {BULK_MAX_ROWS} rows at once",
+    )
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > limit:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+
+def _enrich_members(members: list[dict], users: dict[str, dict]) -> list[dict]:
+    """Attach full_name to group members from a prefetched user map."""
+    enriched = []
+    for m in members:
+        uid = m.get("user_id", "")
+        user = users.get(uid)
+        enriched.append({
+            "user_id": uid,
+            "role": m.get("role", "member"),
+            "full_name": user.get("full_name") if user else None,
+        })
+    return enriched
+
+
+def _to_expense(e: ExpenseInDB) -> Expense:
+    """Build the API response model from a stored expense."""
+    return Expense(
+        id=e.id,
+        title=e.title,
+        amount=from_minor(e.amount_minor, e.currency),
+        currency=e.currency,
+        category=e.category,
+        description=e.description,
+        date=e.date,
+        created_by=e.created_by,
+        group_id=e.group_id,
+        created_at=e.created_at,
+    )
+
+
+def _expense_cursor(doc: dict) -> str:
+    """Cursor pointing just past a raw expense document in (date, _id) order.
+
+    Legacy string dates stay strings: converting them would compare across
+    BSON types, which sort apart.
+    """
+    return encode_cursor(doc["date"], doc["_id"])
+
+
+def _expense_page(docs: list[dict], limit: int) -> dict:
+    """Items and next_cursor from a raw query that fetched limit + 1 documents,
+    plus a sync_token for following later changes via /changes."""
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    return {
+        "items": [expense_to_json(doc) for doc in docs],
+        "limit": limit,
+        "next_cursor": _expense_cursor(docs[-1]) if has_more else None,
+        "sync_token": sync_token(),
+    }
+
+
 # ---- Group endpoints ----
 
 @router.post("", response_model=Group, status_code=status.HTTP_201_CREATED)
@@ -47,6 +139,7 @@ async def create_group(
         created_by=group_in_db.created_by,
         members=group_in_db.members,
         custom_categories=group_in_db.custom_categories,
+        base_currency=group_in_db.base_currency,
         created_at=group_in_db.created_at,
     )
 
@@ -59,28 +152,21 @@ async def list_groups(
 ) -> list[Group]:
     """List all groups the current user belongs to. Members include full_name."""
     groups = await group_repo.get_user_groups(user_id)
-    result = []
-    for g in groups:
-        members_enriched = []
-        for m in g.members:
-            uid = m.get("user_id", "")
-            user = await user_repo.get_by_id(uid)
-            members_enriched.append({
-                "user_id": uid,
-                "role": m.get("role", "member"),
-                "full_name": user.full_name if user else None,
-            })
-        result.append(
-            Group(
-                id=g.id,
-                name=g.name,
-                created_by=g.created_by,
-                members=members_enriched,
-                custom_categories=g.custom_categories,
-                created_at=g.created_at,
-            )
+    users = await user_repo.get_many(
+        [m.get("user_id", "") for g in groups for m in g.members]
+    )
+    return [
+        Group(
+            id=g.id,
+            name=g.name,
+            created_by=g.created_by,
+            members=_enrich_members(g.members, users),
+            custom_categories=g.custom_categories,
+            base_currency=g.base_currency,
+            created_at=g.created_at,
         )
-    return result
+        for g in groups
+    ]
 
 
 @router.get("/{group_id}", response_model=Group)
@@ -90,21 +176,14 @@ async def get_group(
     user_repo: UserRepositoryDep,
 ) -> Group:
     """Get a group by ID (must be a member). Returns members with full_name."""
-    members_enriched = []
-    for m in group.members:
-        user_id = m.get("user_id", "")
-        user = await user_repo.get_by_id(user_id)
-        members_enriched.append({
-            "user_id": user_id,
-            "role": m.get("role", "member"),
-            "full_name": user.full_name if user else None,
-        })
+    users = await user_repo.get_many([m.get("user_id", "") for m in group.members])
     return Group(
         id=group.id,
         name=group.name,
         created_by=group.created_by,
-        members=members_enriched,
+        members=_enrich_members(group.members, users),
         custom_categories=group.custom_categories,
+        base_currency=group.base_currency,
         created_at=group.created_at,
     )
 
@@ -182,17 +261,41 @@ async def create_expense(
     """Add an expense to the group (members only)."""
     try:
         expense_in_db = await expense_service.create_expense(group_id, user_id, data)
-        return Expense(
-            id=expense_in_db.id,
-            title=expense_in_db.title,
-            amount=expense_in_db.amount,
-            category=expense_in_db.category,
-            description=expense_in_db.description,
-            date=expense_in_db.date,
-            created_by=expense_in_db.created_by,
-            group_id=expense_in_db.group_id,
-            created_at=expense_in_db.created_at,
+        return _to_expense(expense_in_db)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{group_id}/expenses/bulk")
+async def bulk_create_expenses(
+    group_id: str,
+    request: Request,
+    user_id: CurrentUserIdDep,
+    group: GroupMemberDep,
+    expense_service: ExpenseServiceDep,
+    ordered: bool = Query(False, description="Stop at the first invalid or failed row"),
+) -> dict:
+    """Import many expenses from a JSON array or a CSV body (Content-Type: text/csv).
+
+    Rows are validated against the group's categories once; per-row errors
+    are returned by 0-based row index.
+    """
+    content_type = request.headers.get("content-type", "")
+    body = await _read_capped_body(request, BULK_MAX_BODY_BYTES)
+    try:
+        if content_type.startswith("text/csv"):
+            rows = expense_service.parse_csv(body.decode("utf-8-sig"))
+        else:
+            rows = orjson.loads(body)
+    except (UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed request body")
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be a JSON array of expense objects or CSV",
         )
+    try:
+        return await expense_service.bulk_create(group, user_id, rows, ordered=ordered)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -205,31 +308,158 @@ async def list_expenses(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
     sort_order: int = Query(-1, description="1 for ascending, -1 for descending by date"),
-) -> dict:
-    """List expenses for a group with pagination and date sorting."""
-    skip = (page - 1) * limit
-    expenses = await expense_repo.get_by_group(group_id, skip=skip, limit=limit, sort_order=sort_order)
-    total = await expense_repo.count_by_group(group_id)
-    return {
-        "items": [
-            Expense(
-                id=e.id,
-                title=e.title,
-                amount=e.amount,
-                category=e.category,
-                description=e.description,
-                date=e.date,
-                created_by=e.created_by,
-                group_id=e.group_id,
-                created_at=e.created_at,
-            )
-            for e in expenses
-        ],
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "pages": (total + limit - 1) // limit,
-    }
+    after: str | None = Query(None, description="Cursor from a previous next_cursor (keyset mode)"),
+    include_total: bool = Query(True, description="Include total/pages in the response"),
+    start: date | None = Query(None, description="Earliest expense date (inclusive)"),
+    end: date | None = Query(None, description="Latest expense date (inclusive)"),
+    category: list[str] | None = Query(None, description="Only these categories (repeatable)"),
+    created_by: str | None = Query(None, description="Only expenses paid by this user"),
+    min_amount: Decimal | None = Query(None, ge=0, description="Minimum amount (inclusive)"),
+    max_amount: Decimal | None = Query(None, ge=0, description="Maximum amount (inclusive)"),
+    currency: str | None = Query(
+        None, pattern=CURRENCY_PATTERN, description="Only expenses in this currency (amount bounds are in it)"
+    ),
+    q: str | None = Query(None, min_length=1, max_length=200, description="Search title and description"),
+) -> ORJSONResponse:
+    """List expenses for a group sorted by date, optionally filtered.
+
+    Pass `after` for keyset pagination (fast at any depth); otherwise `page`
+    selects a page by offset. Amount bounds compare native amounts, so they
+    only match expenses in `currency` (default: the group's base currency).
+    Unfiltered totals come from the group's cached
+    counter; otherwise a count runs concurrently with the page query.
+    """
+    position = None
+    if after is not None:
+        try:
+            position = decode_cursor(after)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    skip = 0 if position else (page - 1) * limit
+    if currency is None and (min_amount is not None or max_amount is not None):
+        currency = group.base_currency
+    try:
+        min_minor = to_minor(min_amount, currency) if min_amount is not None else None
+        max_minor = to_minor(max_amount, currency) if max_amount is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    query = expense_repo.build_filter(
+        group_id,
+        start=start,
+        end=end,
+        categories=category,
+        created_by=created_by,
+        min_amount=min_minor,
+        max_amount=max_minor,
+        search=q,
+        currency=currency,
+    )
+    filtered = len(query) > 1
+    find = expense_repo.get_by_group_raw(
+        group_id, skip=skip, limit=limit + 1, sort_order=sort_order, after=position, query=query
+    )
+    if include_total and (filtered or group.expense_count is None):
+        expenses, total = await asyncio.gather(find, expense_repo.count_by_group(group_id, query))
+    else:
+        expenses, total = await find, group.expense_count
+    result = _expense_page(expenses, limit)
+    if position is None:
+        result["page"] = page
+    if include_total:
+        result["total"] = total
+        result["pages"] = (total + limit - 1) // limit
+    # Raw documents go straight to orjson, skipping response model validation
+    return ORJSONResponse(result)
+
+
+@router.get("/{group_id}/changes")
+async def get_changes(
+    group_id: str,
+    group: GroupMemberDep,
+    changes_service: ChangesServiceDep,
+    since: str | None = Query(
+        None, description="`next` from a previous call, or an expense page's sync_token (omit for a full sync)"
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum items per batch"),
+) -> ORJSONResponse:
+    """Expenses created or modified since a token, oldest change first.
+
+    Keep the returned `next` and poll with it; while `has_more` is true,
+    call again right away. Items near the head of the feed can be returned
+    twice, so apply them by id.
+    """
+    try:
+        result = await changes_service.changes(group_id, since, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return ORJSONResponse(result)
+
+
+@router.get("/{group_id}/events")
+async def group_events(
+    group_id: str,
+    user_id: CurrentUserIdDep,
+    group: GroupMemberDep,
+    group_repo: GroupRepositoryDep,
+    group_service: GroupServiceDep,
+) -> StreamingResponse:
+    """Server-sent events for a group: expense_created, expenses_imported and group_updated.
+
+    The first event, `ready`, carries a sync_token for /changes. After a
+    `resync` event (the client fell behind) or a reconnect, catch up through
+    /changes before relying on the stream again.
+    """
+    try:
+        sub = event_broker.subscribe(group_id, user_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    async def still_member() -> bool:
+        current = await group_repo.get_cached(group_id)
+        return current is not None and group_service.is_member(current, user_id)
+
+    return StreamingResponse(
+        sse_stream(event_broker, sub, {"sync_token": sync_token()}, still_member),
+        media_type="text/event-stream",
+        # No caching or proxy buffering, or events arrive late
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+@router.get("/{group_id}/expenses/export")
+async def export_expenses(
+    group_id: str,
+    group: GroupMemberDep,
+    export_service: ExportServiceDep,
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv | ndjson"),
+    start: date | None = Query(None, description="Earliest expense date (inclusive)"),
+    end: date | None = Query(None, description="Latest expense date (inclusive)"),
+    category: list[str] | None = Query(None, description="Only these categories (repeatable)"),
+    gzip: bool = Query(False, description="Gzip the download"),
+) -> StreamingResponse:
+    """Stream all matching expenses in date order without buffering them in memory."""
+    filename = f"expenses-{group_id}.{fmt}"
+    media_type = EXPORT_MEDIA_TYPES[fmt]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        export_service.stream(
+            group_id,
+            fmt=fmt,
+            start=start,
+            end=end,
+            categories=category,
+            gzip=gzip,
+            base_currency=group.base_currency,
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # ---- Categories (for frontend) ----
@@ -240,11 +470,15 @@ class AddCategoryRequest(BaseModel):
 
 @router.get("/{group_id}/categories")
 async def get_categories(
+    group_id: str,
+    request: Request,
     group: GroupMemberDep,
-) -> dict:
+) -> Response:
     """Get valid expense categories (predefined + group custom)."""
-    categories = list(dict.fromkeys(PREDEFINED_CATEGORIES + group.custom_categories))
-    return {"categories": categories}
+    async def compute() -> dict:
+        return {"categories": list(dict.fromkeys(PREDEFINED_CATEGORIES + group.custom_categories))}
+
+    return await response_cache.respond(request, group_id, "categories", {}, compute)
 
 
 @router.post("/{group_id}/categories", status_code=status.HTTP_201_CREATED)
@@ -266,111 +500,141 @@ async def add_custom_category(
 
 # ---- Stats endpoint ----
 
-def _build_date_match(period: str, year: int | None, month: int | None):
-    """Build $match stage for dateObj based on period. Returns None for 'all'."""
-    from datetime import datetime, timezone
-    if period == "all" or period is None:
-        return None
-    if period == "year" and year is not None:
-        start = datetime(year, 1, 1, tzinfo=timezone.utc)
-        end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
-        return {"dateObj": {"$gte": start, "$lt": end}}
-    if period == "month" and year is not None and month is not None:
-        start = datetime(year, month, 1, tzinfo=timezone.utc)
-        if month == 12:
-            end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
-        else:
-            end = datetime(year, month + 1, 1, tzinfo=timezone.utc)
-        return {"dateObj": {"$gte": start, "$lt": end}}
-    return None
-
-
 @router.get("/{group_id}/stats")
 async def get_group_stats(
     group_id: str,
+    request: Request,
     group: GroupMemberDep,
-    db: DatabaseDep,
-    user_repo: UserRepositoryDep,
+    stats_service: StatsServiceDep,
     period: str = Query("all", description="all | month | year"),
     year: int | None = Query(None, ge=2000, le=2100),
     month: int | None = Query(None, ge=1, le=12),
-) -> dict:
-    """Expense statistics. Use period=month with year/month or period=year with year for filtered pie/total."""
-    from datetime import datetime
-    now = datetime.utcnow()
-    if period == "month" and (year is None or month is None):
-        year, month = now.year, now.month
-    if period == "year" and year is None:
-        year = now.year
-
-    pipeline = [
-        {"$match": {"group_id": group_id}},
-        {
-            "$addFields": {
-                "dateObj": {
-                    "$cond": {
-                        "if": {"$eq": [{"$type": "$date"}, "string"]},
-                        "then": {"$dateFromString": {"dateString": {"$concat": ["$date", "T00:00:00Z"]}}},
-                        "else": "$date",
-                    }
-                }
-            }
-        },
-    ]
-    date_match = _build_date_match(period, year, month)
-    if date_match:
-        pipeline.append({"$match": date_match})
-    pipeline.append({
-        "$facet": {
-            "total": [{"$group": {"_id": None, "total": {"$sum": "$amount"}}}],
-            "by_category": [
-                {"$group": {"_id": "$category", "total": {"$sum": "$amount"}}},
-                {"$sort": {"total": -1}},
-            ],
-            "by_user": [
-                {"$group": {"_id": "$created_by", "total": {"$sum": "$amount"}}},
-                {"$sort": {"total": -1}},
-            ],
-            "monthly": [
-                {
-                    "$group": {
-                        "_id": {
-                            "year": {"$year": "$dateObj"},
-                            "month": {"$month": "$dateObj"},
-                        },
-                        "total": {"$sum": "$amount"},
-                    }
-                },
-                {"$sort": {"_id.year": 1, "_id.month": 1}},
-            ],
-        }
-    })
-    cursor = db.expenses.aggregate(pipeline)
-    result = await cursor.to_list(length=1)
-    if not result:
-        return {
-            "total": 0,
-            "by_category": [],
-            "by_user": [],
-            "monthly": [],
-        }
-    data = result[0]
-    total_val = data["total"][0]["total"] if data["total"] else 0
-    by_user_raw = [{"user_id": x["_id"], "total": round(x["total"], 2)} for x in data["by_user"]]
-    by_user_enriched = []
-    for u in by_user_raw:
-        usr = await user_repo.get_by_id(u["user_id"])
-        by_user_enriched.append({
-            "user_id": u["user_id"],
-            "total": u["total"],
-            "full_name": usr.full_name if usr else None,
-        })
-    return {
-        "total": round(total_val, 2),
-        "by_category": [{"category": x["_id"], "total": round(x["total"], 2)} for x in data["by_category"]],
-        "by_user": by_user_enriched,
-        "monthly": [
-            {"year": x["_id"]["year"], "month": x["_id"]["month"], "total": round(x["total"], 2)}
-            for x in data["monthly"]
-        ],
+) -> Response:
+    """Expense statistics. Use period=month with year/month or period=year with year for filtered pie/total.
+
+    Responses carry an ETag; send it back in If-None-Match to get a 304 while
+    the group is unchanged.
+    """
+    year, month = stats_service.resolve_period(period, year, month)
+    try:
+        return await response_cache.respond(
+            request,
+            group_id,
+            "stats",
+            {"year": year, "month": month},
+            lambda: stats_service.get_group_stats(group_id, period, year, month, group.base_currency),
+            cacheable=analytics_reads_primary(),
+        )
+    except MissingRateError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+# ---- Overview ----
+
+OVERVIEW_FIELDS = ("group", "categories", "expenses", "stats")
+
+
+@router.get("/{group_id}/overview")
+async def get_group_overview(
+    group_id: str,
+    group: GroupMemberDep,
+    user_repo: UserRepositoryDep,
+    expense_repo: ExpenseRepositoryDep,
+    stats_service: StatsServiceDep,
+    fields: str | None = Query(
+        None, description="Comma-separated subset of group,categories,expenses,stats (default: all)"
+    ),
+    limit: int = Query(20, ge=1, le=100, description="Recent expenses to include"),
+) -> ORJSONResponse:
+    """Group page data in one request: the group with member names, categories,
+    the first page of recent expenses and current-month stats.
+
+    Auth and the group lookup happen once; the selected parts are fetched
+    concurrently. `expenses` has the same shape as a cursor-mode
+    /expenses page, so clients can continue from its next_cursor.
+    """
+    selected = OVERVIEW_FIELDS if fields is None else tuple(
+        f.strip() for f in fields.split(",") if f.strip()
+    )
+    unknown = set(selected) - set(OVERVIEW_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+
+    async def group_part() -> dict:
+        users = await user_repo.get_many([m.get("user_id", "") for m in group.members])
+        return Group(
+            id=group.id,
+            name=group.name,
+            created_by=group.created_by,
+            members=_enrich_members(group.members, users),
+            custom_categories=group.custom_categories,
+            base_currency=group.base_currency,
+            created_at=group.created_at,
+        ).model_dump(mode="json")
+
+    async def categories_part() -> list[str]:
+        return list(dict.fromkeys(PREDEFINED_CATEGORIES + group.custom_categories))
+
+    async def expenses_part() -> dict:
+        docs = await expense_repo.get_by_group_raw(group_id, limit=limit + 1, sort_order=-1)
+        return _expense_page(docs, limit)
+
+    async def stats_part() -> dict:
+        year, month = stats_service.resolve_period("month", None, None)
+        stats = await stats_service.get_group_stats(group_id, "month", year, month, group.base_currency)
+        return {"year": year, "month": month, **stats}
+
+    parts = {
+        "group": group_part,
+        "categories": categories_part,
+        "expenses": expenses_part,
+        "stats": stats_part,
     }
+    names = [name for name in OVERVIEW_FIELDS if name in selected]
+    try:
+        results = await asyncio.gather(*(parts[name]() for name in names))
+    except MissingRateError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    return ORJSONResponse(dict(zip(names, results)))
+
+
+# ---- Settlements ----
+
+@router.get("/{group_id}/settlements")
+async def get_settlements(
+    group_id: str,
+    group: GroupMemberDep,
+    settlement_service: SettlementServiceDep,
+) -> dict:
+    """Net balances per member and the transfers that would settle the group."""
+    try:
+        return await settlement_service.get_settlements(group)
+    except MissingRateError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+
+@router.post("/{group_id}/settlements", response_model=Settlement, status_code=status.HTTP_201_CREATED)
+async def record_settlement(
+    group_id: str,
+    data: SettlementCreate,
+    user_id: CurrentUserIdDep,
+    group: GroupMemberDep,
+    settlement_service: SettlementServiceDep,
+) -> Settlement:
+    """Record a payment from the current user to another member."""
+    try:
+        s = await settlement_service.record_settlement(group, user_id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return Settlement(
+        id=s.id,
+        group_id=s.group_id,
+        from_user=s.from_user,
+        to_user=s.to_user,
+        amount=s.amount,
+        note=s.note,
+        created_at=s.created_at,
+    )
@@ -0,0 +1,38 @@
+"""Recompute the cached expense_count on every group document.
+
+Usage:
+    python -m app.commands.backfill_expense_counts
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import database
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.group_repository import GroupRepository
+
+
+async def backfill() -> int:
+    """Set expense_count on all groups from the expenses collection. Returns group count."""
+    await database.connect()
+    try:
+        group_repo = GroupRepository(database.db)
+        counts = await ExpenseRepository(database.db).count_all_groups()
+        updated = 0
+        async for doc in group_repo.collection.find({}, {"_id": 1}):
+            group_id = str(doc["_id"])
+            await group_repo.set_expense_count(group_id, counts.get(group_id, 0))
+            updated += 1
+        return updated
+    finally:
+        await database.disconnect()
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__.splitlines()[0]).parse_args()
+    updated = asyncio.run(backfill())
+    print(f"Updated expense_count on {updated} groups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Rebuild the expense_rollups collection from the raw expenses collection.
+
+Usage:
+    python -m app.commands.backfill_rollups [--group-id GROUP_ID]
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import database
+from app.repositories.rollup_repository import ExpenseRollupRepository
+
+
+async def backfill(group_id: str | None = None) -> int:
+    """Rebuild rollups for one group, or all groups. Returns bucket count."""
+    await database.connect()
+    try:
+        repo = ExpenseRollupRepository(database.db)
+        await repo.ensure_indexes()
+        return await repo.rebuild(group_id)
+    finally:
+        await database.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--group-id", help="Only rebuild this group (default: all groups)")
+    args = parser.parse_args()
+    buckets = asyncio.run(backfill(args.group_id))
+    print(f"Rebuilt {buckets} rollup buckets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Convert legacy float expense amounts to integer minor units (resumable).
+
+Usage:
+    python -m app.commands.migrate_expense_amounts [--batch-size N] [--pause SECONDS] [--skip-rollups]
+
+Afterwards the expense rollups are rebuilt so their totals are stored in
+minor units too (stats read either form, so this can be deferred).
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import database
+from app.repositories.rollup_repository import ExpenseRollupRepository
+from app.services.migration_service import ExpenseAmountMigration
+
+
+async def migrate(batch_size: int, pause: float, rebuild_rollups: bool) -> tuple[int, int]:
+    """Run the migration. Returns (converted, remaining)."""
+    await database.connect()
+    try:
+        migration = ExpenseAmountMigration(database.db)
+        converted = await migration.run(batch_size=batch_size, pause=pause)
+        remaining = await migration.remaining()
+        if rebuild_rollups and converted:
+            buckets = await ExpenseRollupRepository(database.db).rebuild()
+            print(f"Rebuilt {buckets} rollup buckets")
+        return converted, remaining
+    finally:
+        await database.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.0, help="Sleep between batches")
+    parser.add_argument("--skip-rollups", action="store_true", help="Do not rebuild expense_rollups")
+    args = parser.parse_args()
+    converted, remaining = asyncio.run(migrate(args.batch_size, args.pause, not args.skip_rollups))
+    print(f"Converted {converted} expenses; {remaining} legacy amounts remain")
+
+
+if __name__ == "__main__":
+    main()
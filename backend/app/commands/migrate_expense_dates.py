@@ -0,0 +1,35 @@
+"""Convert legacy string expense dates to BSON dates (resumable).
+
+Usage:
+    python -m app.commands.migrate_expense_dates [--batch-size N] [--pause SECONDS]
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import database
+from app.services.migration_service import ExpenseDateMigration
+
+
+async def migrate(batch_size: int, pause: float) -> tuple[int, int]:
+    """Run the migration. Returns (converted, remaining)."""
+    await database.connect()
+    try:
+        migration = ExpenseDateMigration(database.db)
+        converted = await migration.run(batch_size=batch_size, pause=pause)
+        return converted, await migration.remaining()
+    finally:
+        await database.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.0, help="Sleep between batches")
+    args = parser.parse_args()
+    converted, remaining = asyncio.run(migrate(args.batch_size, args.pause))
+    print(f"Converted {converted} expenses; {remaining} legacy dates remain")
+
+
+if __name__ == "__main__":
+    main()
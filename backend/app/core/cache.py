@@ -0,0 +1,98 @@
+"""In-process caching primitives."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after `ttl` seconds.
+
+    Not thread-safe; intended for use from the event loop only. Each key has
+    a generation that changes whenever the key is invalidated or replaced,
+    so callers can avoid storing a value that was loaded before a concurrent
+    write to the same key (see `generation()` and `set(..., generation=)`).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # Per-key write counters; `_epoch` changes them all at once (clear, or pruning)
+        self._generations: dict[Hashable, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def generation(self, key: Hashable) -> tuple[int, int]:
+        """Token to pass to `set` after loading `key` from the source."""
+        return self._epoch, self._generations.get(key, 0)
+
+    def _bump(self, key: Hashable) -> None:
+        if key not in self._generations and len(self._generations) >= 4 * max(self.maxsize, 1):
+            # Forget old counters; tokens handed out before this no longer match
+            self._generations.clear()
+            self._epoch += 1
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        generation: tuple[int, int] | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Store a value. Skipped if an invalidation happened since `generation`."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        if generation is not None and generation != self.generation(key):
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def replace(self, key: Hashable, update: Callable[[Any], Any]) -> None:
+        """Apply `update` to a cached value in place, keeping its expiry.
+
+        Loads of `key` already in flight are not stored afterwards.
+        """
+        self._bump(key)
+        item = self._data.get(key)
+        if item is not None:
+            self._data[key] = (item[0], update(item[1]))
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key."""
+        self._bump(key)
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all keys."""
+        self._generations.clear()
+        self._epoch += 1
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters."""
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -24,12 +24,76 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "group_expense_tracker"
+    MONGO_COMMAND_MONITORING: bool = True
+    MONGO_SLOW_QUERY_MS: float = 100.0
+
+    # Motor connection pool (per process)
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_CONNECTING: int = 2
+    MONGO_MAX_IDLE_TIME_MS: int | None = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int | None = None
+    # Wire compression, in order of preference, e.g. "zstd,snappy,zlib"
+    # (zstd needs the zstandard package, snappy needs python-snappy)
+    MONGO_COMPRESSORS: str = ""
+    MONGO_ZLIB_COMPRESSION_LEVEL: int = 6
+    # Default reads stay on the primary; stats and exports may be moved to
+    # secondaries (e.g. "secondaryPreferred"), which makes them lag writes
+    # and turns off response caching for stats
+    MONGO_READ_PREFERENCE: str = "primary"
+    MONGO_ANALYTICS_READ_PREFERENCE: str = "primary"
 
     # JWT
     JWT_SECRET_KEY: str = "change-me-in-production-use-openssl-rand-hex-32"
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # "jose", "hmac" (stdlib, HS* only) or "pyjwt" (optional package)
+    JWT_BACKEND: str = "jose"
+    # Verified tokens cached until their exp
+    JWT_CACHE_MAX_SIZE: int = 10000
+    # How often each worker pulls session revocations made by other workers
+    REVOCATION_SYNC_SECONDS: float = 5.0
+
+    # Password hashing (bcrypt runs in a thread pool off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+
+    # Group cache (per-process; bounds cross-worker staleness of membership)
+    GROUP_CACHE_TTL_SECONDS: float = 30.0
+    GROUP_CACHE_MAX_SIZE: int = 10000
+
+    # Response cache for stats/categories (per-process unless a shared backend is plugged in)
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+    RESPONSE_CACHE_MAX_SIZE: int = 4096
+
+    # Legacy string expense dates: convert in the background at startup
+    EXPENSE_DATE_MIGRATION_ON_STARTUP: bool = False
+    EXPENSE_DATE_MIGRATION_BATCH_SIZE: int = 1000
+
+    # Legacy float expense amounts: convert to minor units in the background at startup
+    EXPENSE_AMOUNT_MIGRATION_ON_STARTUP: bool = False
+    EXPENSE_AMOUNT_MIGRATION_BATCH_SIZE: int = 1000
+
+    # Change feed tokens stay this far behind now, covering writes still in flight
+    CHANGES_SETTLE_SECONDS: float = 5.0
+
+    # Live group events (SSE): per-stream queue bound, keepalive interval and streams per worker
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    EVENTS_MAX_SUBSCRIBERS: int = 10000
+    # Relay events between workers through MongoDB change streams (replica sets only)
+    EVENTS_CHANGE_STREAMS: bool = False
+
+    # Prometheus /metrics endpoint and request instrumentation
+    METRICS_ENABLED: bool = True
+
+    # Money: amounts are stored as integer minor units of this ISO 4217 currency
+    DEFAULT_CURRENCY: str = "USD"
+
+    # Exchange rates: local CSV/JSON table (units of currency per pivot unit); empty disables conversion
+    FX_RATES_PATH: str = ""
+    FX_PIVOT_CURRENCY: str = "EUR"
 
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:8080"
@@ -0,0 +1,96 @@
+"""Per-request context shared across dependencies, services and repositories."""
+
+import time
+from contextvars import ContextVar
+
+from starlette.datastructures import MutableHeaders
+
+
+def route_template(scope: dict) -> str | None:
+    """Path template of the matched route (e.g. /api/v1/groups/{group_id}), or None before routing."""
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return None
+    path = scope.get("path", "")
+    regex = getattr(route, "path_regex", None)
+    if regex is None or regex.match(path):
+        return template
+    # Some FastAPI versions leave outer router prefixes off route.path; recover them from the path
+    parts = path.split("/")
+    keep = len(parts) - len(template.split("/")) + 1
+    prefix = "/".join(parts[:keep]) if keep > 0 else ""
+    return prefix + template
+
+
+class RequestContext:
+    """State for one HTTP request.
+
+    `db_commands` is appended to from Motor's executor threads (which run with
+    a copy of the request's context); list.append is atomic, so no lock.
+    """
+
+    __slots__ = ("scope", "memo", "db_commands", "started_at")
+
+    def __init__(self, scope: dict) -> None:
+        self.scope = scope
+        self.memo: dict = {}
+        self.db_commands: list[tuple[str, str | None, float, int]] = []  # (name, collection, ms, docs)
+        self.started_at = time.perf_counter()
+
+    @property
+    def route(self) -> str:
+        """Route template once routing has happened (e.g. /api/v1/groups/{group_id}), else the path."""
+        path = route_template(self.scope) or self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}"
+
+    def server_timing(self) -> str:
+        """Server-Timing header value with total DB time and query count."""
+        commands = list(self.db_commands)
+        db_ms = sum(c[2] for c in commands)
+        app_ms = (time.perf_counter() - self.started_at) * 1000
+        return f'db;dur={db_ms:.2f};desc="{len(commands)} queries", app;dur={app_ms:.2f}'
+
+
+_request_context: ContextVar[RequestContext | None] = ContextVar("request_context", default=None)
+
+
+def current_request() -> RequestContext | None:
+    """Context of the current HTTP request, or None outside a request."""
+    return _request_context.get()
+
+
+def request_memo() -> dict | None:
+    """Memo dict for the current HTTP request, or None outside a request."""
+    ctx = _request_context.get()
+    return ctx.memo if ctx is not None else None
+
+
+class RequestContextMiddleware:
+    """ASGI middleware that gives each HTTP request a fresh RequestContext
+    and reports its database usage in a Server-Timing response header."""
+
+    def __init__(self, app, timing_allow_origin: str | None = None) -> None:
+        self.app = app
+        # Lets these cross-origin callers read Server-Timing (Resource Timing API)
+        self.timing_allow_origin = timing_allow_origin
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        ctx = RequestContext(scope)
+        token = _request_context.set(ctx)
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", ctx.server_timing())
+                if self.timing_allow_origin:
+                    headers["Timing-Allow-Origin"] = self.timing_allow_origin
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_context.reset(token)
@@ -1,8 +1,38 @@
 """Motor async MongoDB connection setup."""
 
+import logging
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
+
+from app.core.config import Settings, get_settings
+from app.core.db_monitoring import CommandLogger, PoolMetricsListener
+
+logger = logging.getLogger(__name__)
+
 
-from app.core.config import get_settings
+def _read_preference(name: str):
+    return make_read_preference(read_pref_mode_from_name(name), None)
+
+
+def client_options(settings: Settings) -> dict:
+    """Pool, compression and read preference options for AsyncIOMotorClient."""
+    options = {
+        "serverSelectionTimeoutMS": 5000,
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxConnecting": settings.MONGO_MAX_CONNECTING,
+        "readPreference": settings.MONGO_READ_PREFERENCE,
+    }
+    if settings.MONGO_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGO_MAX_IDLE_TIME_MS
+    if settings.MONGO_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+        if "zlib" in settings.MONGO_COMPRESSORS:
+            options["zlibCompressionLevel"] = settings.MONGO_ZLIB_COMPRESSION_LEVEL
+    return options
 
 
 class DatabaseManager:
@@ -11,24 +41,39 @@ class DatabaseManager:
     def __init__(self) -> None:
         self._client: AsyncIOMotorClient | None = None
         self._db: AsyncIOMotorDatabase | None = None
+        self._analytics_db: AsyncIOMotorDatabase | None = None
+        self._pool_listener: PoolMetricsListener | None = None
 
     async def connect(self) -> None:
         """Establish connection to MongoDB."""
         settings = get_settings()
+        self._pool_listener = PoolMetricsListener()
+        listeners = [self._pool_listener]
+        if settings.MONGO_COMMAND_MONITORING:
+            listeners.append(CommandLogger(slow_ms=settings.MONGO_SLOW_QUERY_MS))
         self._client = AsyncIOMotorClient(
             settings.MONGODB_URL,
-            serverSelectionTimeoutMS=5000,
+            event_listeners=listeners,
+            **client_options(settings),
         )
         self._db = self._client[settings.MONGODB_DB_NAME]
+        # Same connection pool, different read preference for read-heavy analytics
+        self._analytics_db = self._client.get_database(
+            settings.MONGODB_DB_NAME,
+            read_preference=_read_preference(settings.MONGO_ANALYTICS_READ_PREFERENCE),
+        )
         # Verify connection
         await self._client.admin.command("ping")
 
     async def disconnect(self) -> None:
         """Close MongoDB connection."""
         if self._client:
+            if self._pool_listener is not None:
+                logger.info("Mongo connection pool stats: %s", self._pool_listener.stats())
             self._client.close()
             self._client = None
             self._db = None
+            self._analytics_db = None
 
     @property
     def db(self) -> AsyncIOMotorDatabase:
@@ -37,6 +82,17 @@ class DatabaseManager:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._db
 
+    @property
+    def analytics_db(self) -> AsyncIOMotorDatabase:
+        """Database handle using MONGO_ANALYTICS_READ_PREFERENCE. Raises if not connected.
+
+        Only for reads that tolerate replication lag (stats, exports); writes
+        and membership checks go through `db`.
+        """
+        if self._analytics_db is None:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        return self._analytics_db
+
 
 # Global database manager instance
 database = DatabaseManager()
@@ -45,3 +101,13 @@ database = DatabaseManager()
 async def get_database() -> AsyncIOMotorDatabase:
     """FastAPI dependency for database access."""
     return database.db
+
+
+def analytics_reads_primary() -> bool:
+    """Whether analytics reads see every acknowledged write (no replication lag)."""
+    return get_settings().MONGO_ANALYTICS_READ_PREFERENCE == "primary"
+
+
+async def get_analytics_database() -> AsyncIOMotorDatabase:
+    """FastAPI dependency for lag-tolerant analytics reads."""
+    return database.analytics_db
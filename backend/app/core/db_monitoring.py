@@ -0,0 +1,168 @@
+"""Mongo command instrumentation: per-request attribution and a slow-query log."""
+
+import logging
+
+from pymongo import monitoring
+
+from app.core import metrics
+from app.core.context import current_request
+
+logger = logging.getLogger(__name__)
+
+# Commands whose first value is the target collection name
+_COLLECTION_COMMANDS = {
+    "find", "aggregate", "count", "distinct", "insert", "update", "delete",
+    "findAndModify", "createIndexes",
+}
+
+
+def redact(value):
+    """Keep the shape of a filter (keys and operators) but hide literal values."""
+    if isinstance(value, dict):
+        return {k: redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return "?"
+
+
+def _command_filter(command_name: str, command: dict):
+    if "filter" in command:
+        return command["filter"]
+    if "query" in command:
+        return command["query"]
+    if command_name == "aggregate":
+        return [stage for stage in command.get("pipeline", []) if "$match" in stage]
+    for key in ("updates", "deletes"):
+        if command.get(key):
+            return command[key][0].get("q")
+    return None
+
+
+def _docs_returned(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    n = reply.get("n", 0)
+    return n if isinstance(n, int) else 0
+
+
+class CommandLogger(monitoring.CommandListener):
+    """Records every command against the current request and logs slow ones.
+
+    Registered per client in DatabaseManager.connect. Callbacks run on Motor's
+    executor threads with the request's context copied in.
+    """
+
+    def __init__(self, slow_ms: float = 100.0) -> None:
+        self.slow_ms = slow_ms
+        # (connection, request_id) -> (collection, command) between started and finished
+        self._pending: dict[tuple, tuple[str | None, dict]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        name = event.command_name
+        if name in _COLLECTION_COMMANDS:
+            collection = event.command.get(name)
+        elif name == "getMore":
+            collection = event.command.get("collection")
+        else:
+            collection = None
+        self._pending[(event.connection_id, event.request_id)] = (collection, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, _docs_returned(event.reply))
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, 0)
+
+    def _finish(self, event, docs: int) -> None:
+        collection, command = self._pending.pop((event.connection_id, event.request_id), (None, {}))
+        duration_ms = event.duration_micros / 1000
+        ctx = current_request()
+        if ctx is not None:
+            ctx.db_commands.append((event.command_name, collection, duration_ms, docs))
+        if duration_ms >= self.slow_ms:
+            logger.warning(
+                "Slow Mongo %s on %s: %.1f ms, %d docs, route=%s, filter=%s",
+                event.command_name,
+                collection,
+                duration_ms,
+                docs,
+                ctx.route if ctx is not None else "-",
+                redact(_command_filter(event.command_name, command)),
+            )
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Feeds connection pool checkout waits and usage into the /metrics registry
+    and keeps per-client totals for the shutdown summary."""
+
+    def __init__(self) -> None:
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.pool_clears = 0
+
+    def _record_wait(self, duration: float | None) -> None:
+        if duration is None:
+            return
+        metrics.mongo_pool_checkout_wait.observe(duration)
+        self.total_wait += duration
+        self.max_wait = max(self.max_wait, duration)
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        metrics.mongo_pool_checked_out.inc()
+        self.checkouts += 1
+        self.checked_out += 1
+        self.max_checked_out = max(self.max_checked_out, self.checked_out)
+        self._record_wait(event.duration)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        metrics.mongo_pool_checkout_failures.inc((event.reason,))
+        self.checkout_failures += 1
+        self._record_wait(event.duration)
+
+    def connection_checked_in(self, event) -> None:
+        metrics.mongo_pool_checked_out.dec()
+        self.checked_out -= 1
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        self.pool_clears += 1
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        self.connections_created += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self.connections_closed += 1
+
+    def stats(self) -> dict:
+        """Totals since the client was created."""
+        return {
+            "connections_created": self.connections_created,
+            "connections_closed": self.connections_closed,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "max_checked_out": self.max_checked_out,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "pool_clears": self.pool_clears,
+        }
@@ -0,0 +1,310 @@
+"""In-process pub/sub for live group events (served as SSE).
+
+Writers call `publish(group_id, event, data)`. Every open /events stream of
+that group is a Subscription with a bounded queue, and publishing never
+waits. A subscriber whose queue is full is a slow consumer: it is dropped,
+its queue is replaced by a single RESYNC marker, and the client reconnects
+and catches up through /changes.
+
+Idle connections cost a queue and a set entry. They share one heartbeat
+task, which pings every queue so that proxies keep the connection open
+and disconnected clients are noticed on the next write.
+
+By default events only reach streams on the worker that made the change.
+With EVENTS_CHANGE_STREAMS on a replica set, ChangeStreamRelay feeds the
+broker from MongoDB change streams instead. Every worker then sees every
+write, and local publishing is switched off so events are not delivered
+twice. The relay holds inserts for up to RELAY_MAX_DELAY and delivers a
+burst in one group as a single expenses_imported event. A bulk import
+would otherwise overflow every subscriber's queue.
+
+Membership is checked when a stream opens and again before each event it
+sends. A member removed on another worker therefore stops receiving
+events once that worker's group cache expires.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+import orjson
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.models.expense import expense_to_json
+
+logger = logging.getLogger(__name__)
+
+# Server error when a resume token has fallen off the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+# Longest the relay holds inserts to coalesce them (seconds)
+RELAY_MAX_DELAY = 0.25
+
+# Queue markers (not sent to clients as data)
+PING = ("ping", None)
+RESYNC = ("resync", None)
+CLOSE = ("close", None)
+
+
+class Subscription:
+    """One open event stream."""
+
+    __slots__ = ("group_id", "user_id", "queue", "dropped")
+
+    def __init__(self, group_id: str, user_id: str, maxsize: int) -> None:
+        self.group_id = group_id
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def offer(self, item: tuple) -> bool:
+        """Enqueue without waiting. Returns False if the queue is full."""
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def replace_with(self, item: tuple) -> None:
+        """Discard anything queued and leave only `item`."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+
+
+class EventBroker:
+    """Fan-out of group events to the subscriptions of this process."""
+
+    def __init__(self, queue_size: int = 100, max_subscribers: int = 10000) -> None:
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._groups: dict[str, set[Subscription]] = {}
+        self._count = 0
+        # True while a change stream relay feeds the broker
+        self.relay_active = False
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, group_id: str, user_id: str) -> Subscription:
+        """Open a subscription. Raises RuntimeError when the worker is at capacity."""
+        if self._count >= self.max_subscribers:
+            raise RuntimeError("Too many open event streams")
+        sub = Subscription(group_id, user_id, self.queue_size)
+        self._groups.setdefault(group_id, set()).add(sub)
+        self._count += 1
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._groups.get(sub.group_id)
+        if subs is not None and sub in subs:
+            subs.discard(sub)
+            self._count -= 1
+            if not subs:
+                del self._groups[sub.group_id]
+
+    def publish(self, group_id: str, event: str, data: dict) -> None:
+        """Publish a change made by this process (ignored while the relay delivers changes)."""
+        if not self.relay_active:
+            self.dispatch(group_id, event, data)
+
+    def dispatch(self, group_id: str, event: str, data: dict) -> None:
+        """Deliver to every subscription of the group, dropping slow consumers."""
+        subs = self._groups.get(group_id)
+        if not subs:
+            return
+        self.published += 1
+        for sub in list(subs):
+            if not sub.offer((event, data)):
+                self._drop(sub)
+
+    def _drop(self, sub: Subscription) -> None:
+        sub.dropped = True
+        sub.replace_with(RESYNC)
+        self.unsubscribe(sub)
+        self.dropped += 1
+        logger.info("Dropped slow event consumer in group %s", sub.group_id)
+
+    def _all(self) -> Iterable[Subscription]:
+        return [sub for subs in self._groups.values() for sub in subs]
+
+    async def heartbeat(self, interval: float) -> None:
+        """Ping every subscription forever; cancelled at shutdown."""
+        while True:
+            await asyncio.sleep(interval)
+            for sub in self._all():
+                sub.offer(PING)  # a full queue already has something to send
+
+    def close_all(self) -> None:
+        """End every stream (at shutdown)."""
+        for sub in self._all():
+            sub.replace_with(CLOSE)
+            self.unsubscribe(sub)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class ChangeStreamRelay:
+    """Feeds a broker from MongoDB change streams (replica sets only)."""
+
+    def __init__(self, db: AsyncIOMotorDatabase, broker: EventBroker) -> None:
+        self.db = db
+        self.broker = broker
+        self._resume_token = None
+
+    async def available(self) -> bool:
+        """Change streams need a replica set or sharded cluster."""
+        hello = await self.db.client.admin.command("hello")
+        return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+    async def _relay(self) -> None:
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"ns.coll": "expenses", "operationType": "insert"},
+                        {"ns.coll": "groups", "operationType": "update"},
+                    ]
+                }
+            }
+        ]
+        async with self.db.watch(
+            pipeline,
+            full_document="updateLookup",
+            resume_after=self._resume_token,
+            max_await_time_ms=int(RELAY_MAX_DELAY * 1000),
+        ) as stream:
+            self.broker.relay_active = True
+            # Inserts are held briefly and delivered per group, so a bulk import
+            # becomes one expenses_imported event rather than one event per row
+            pending: dict[str, list[dict]] = {}
+            held_since = 0.0
+            loop = asyncio.get_running_loop()
+            while stream.alive:
+                change = await stream.try_next()  # None once a wait of max_await_time_ms finds nothing
+                if change is not None and change["ns"]["coll"] == "expenses":
+                    if not pending:
+                        held_since = loop.time()
+                    pending.setdefault(change["fullDocument"]["group_id"], []).append(change["fullDocument"])
+                    if loop.time() - held_since < RELAY_MAX_DELAY:
+                        continue
+                self._flush(pending)
+                if change is not None and change["ns"]["coll"] == "groups":
+                    self._group_updated(change)
+                # Advance only past changes that have been delivered
+                self._resume_token = stream.resume_token
+
+    def _flush(self, pending: dict[str, list[dict]]) -> None:
+        for group_id, docs in pending.items():
+            if len(docs) == 1:
+                self.broker.dispatch(group_id, "expense_created", expense_to_json(docs[0]))
+            else:
+                # Clients fetch the rows through /changes, as after a local bulk import
+                self.broker.dispatch(group_id, "expenses_imported", {"count": len(docs)})
+        pending.clear()
+
+    def _group_updated(self, change: dict) -> None:
+        doc = change.get("fullDocument")
+        if doc is None:  # group deleted before the lookup
+            return
+        # Counter bumps accompany expense inserts, which have their own event
+        update = change["updateDescription"]
+        changed = {key.split(".")[0] for key in update["updatedFields"]}
+        changed |= set(update.get("removedFields", []))
+        fields = sorted(changed - {"expense_count", "updated_at"})
+        if fields:
+            data = group_event(fields)
+            if "members" in fields:
+                data["members"] = [m.get("user_id") for m in doc.get("members", [])]
+            self.broker.dispatch(str(doc["_id"]), "group_updated", data)
+
+    async def run(self, retry_seconds: float = 5.0) -> None:
+        """Relay forever, falling back to local publishing while the stream is down."""
+        while True:
+            try:
+                await self._relay()
+            except PyMongoError as e:
+                logger.exception("Change stream failed; falling back to local events")
+                if isinstance(e, OperationFailure) and e.code == CHANGE_STREAM_HISTORY_LOST:
+                    # Start afresh; clients pick up the gap through /changes
+                    self._resume_token = None
+            finally:
+                self.broker.relay_active = False
+            await asyncio.sleep(retry_seconds)
+
+
+def group_event(fields: list[str], removed: str | None = None) -> dict:
+    """Payload of a group_updated event. `removed` is the user_id of a
+    removed member, whose open streams end on receiving it."""
+    data: dict = {"fields": fields}
+    if removed is not None:
+        data["removed"] = removed
+    return data
+
+
+def ends_stream(sub: Subscription, event: str, data: dict | None) -> bool:
+    """Whether a group_updated event means the subscriber is no longer a member."""
+    if event != "group_updated" or data is None:
+        return False
+    if data.get("removed") == sub.user_id:
+        return True
+    return "members" in data and sub.user_id not in data["members"]
+
+
+def format_event(event: str, data: dict) -> bytes:
+    """One SSE message."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+async def sse_stream(
+    broker: EventBroker,
+    sub: Subscription,
+    ready: dict,
+    still_member: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[bytes]:
+    """Body of an /events response: a `ready` event, then the subscription's events.
+
+    Ends after a resync or close marker, or when the subscriber leaves the
+    group. A removal made on another worker does not reach this broker, so
+    membership is checked again (through the group cache) before each event
+    and ping; the stream closes within a cache TTL of the removal. The
+    subscription is released however the stream ends, including when the
+    client disconnects.
+    """
+    try:
+        yield format_event("ready", ready)
+        while True:
+            event, data = await sub.queue.get()
+            if event in ("resync", "close"):
+                yield format_event(event, {})
+                return
+            if not await still_member():
+                yield format_event("close", {})
+                return
+            if event == "ping":
+                yield b": ping\n\n"
+                continue
+            yield format_event(event, data)
+            if ends_stream(sub, event, data):
+                return
+    finally:
+        broker.unsubscribe(sub)
+
+
+_settings = get_settings()
+
+# Global event broker instance
+event_broker = EventBroker(
+    queue_size=_settings.EVENTS_QUEUE_SIZE,
+    max_subscribers=_settings.EVENTS_MAX_SUBSCRIBERS,
+)
+metrics.registry.callback_gauge("event_subscribers", "Open /events streams.", lambda: len(event_broker))
+metrics.registry.callback_counter(
+    "events_published_total", "Events delivered to at least one stream.", lambda: event_broker.published,
+)
+metrics.registry.callback_counter(
+    "event_consumers_dropped_total", "Streams dropped for falling behind.", lambda: event_broker.dropped,
+)
@@ -0,0 +1,190 @@
+"""Exchange rates from a local table (no network).
+
+Rates are loaded from FX_RATES_PATH, either a CSV with `date,currency,rate`
+columns or JSON shaped like `{"2026-01-02": {"USD": "1.0321", ...}}`. Each
+rate is the number of units of `currency` per one unit of
+FX_PIVOT_CURRENCY. For each currency the table keeps parallel sorted lists
+of date ordinals and rates. The rate on a day is the latest one on or before
+it, found by binary search.
+
+Conversions are batched: an exact rational factor is computed once per
+distinct (currency, date) or (currency, month), then applied to every amount
+sharing it with integer arithmetic. Callers pass whole columns rather than
+converting document by document.
+"""
+
+import bisect
+import csv
+import json
+import logging
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.core.money import minor_exponent
+
+logger = logging.getLogger(__name__)
+
+
+class MissingRateError(LookupError):
+    """A conversion needs a currency the rate table has no rates for."""
+
+
+class RateTable:
+    """Date-indexed exchange rates against a pivot currency."""
+
+    def __init__(self, pivot: str = "EUR") -> None:
+        self.pivot = pivot
+        self._days: dict[str, list[int]] = {}
+        self._rates: dict[str, list[Decimal]] = {}
+        self._month_rates: dict[tuple[str, int, int], Decimal] = {}
+
+    def load(self, rows: Iterable[tuple[date, str, Decimal]]) -> int:
+        """Replace the table with (day, currency, rate) rows. Returns the number of rates kept."""
+        by_currency: dict[str, dict[int, Decimal]] = {}
+        for day, currency, rate in rows:
+            if rate <= 0:
+                raise ValueError(f"Non-positive {currency} rate on {day}")
+            by_currency.setdefault(currency, {})[day.toordinal()] = rate
+        days, rates = {}, {}
+        for currency, series in by_currency.items():
+            ordinals = sorted(series)
+            days[currency] = ordinals
+            rates[currency] = [series[o] for o in ordinals]
+        # Swap in whole so concurrent readers never see a half-loaded table
+        self._days, self._rates, self._month_rates = days, rates, {}
+        return sum(len(r) for r in rates.values())
+
+    def load_file(self, path: str | Path) -> int:
+        """Load a .csv or .json rates file (see module docstring)."""
+        path = Path(path)
+        try:
+            if path.suffix.lower() == ".json":
+                data = json.loads(path.read_text())
+                rows = [
+                    (date.fromisoformat(day), currency, Decimal(str(rate)))
+                    for day, quotes in data.items()
+                    for currency, rate in quotes.items()
+                ]
+            else:
+                with path.open(newline="") as f:
+                    rows = [
+                        (date.fromisoformat(r["date"].strip()), r["currency"].strip(), Decimal(r["rate"].strip()))
+                        for r in csv.DictReader(f)
+                    ]
+        except (KeyError, AttributeError, InvalidOperation) as e:
+            raise ValueError(f"Malformed rates file {path}: {e!r}") from None
+        n = self.load(rows)
+        logger.info("Loaded %d exchange rates for %d currencies from %s", n, len(self._days), path)
+        return n
+
+    @property
+    def currencies(self) -> set[str]:
+        return {self.pivot, *self._days}
+
+    def supports(self, currency: str) -> bool:
+        return currency == self.pivot or currency in self._days
+
+    def can_convert(self, source: str, target: str) -> bool:
+        return source == target or (self.supports(source) and self.supports(target))
+
+    def missing(self, currencies: Iterable[str]) -> list[str]:
+        """Currencies among those in use that conversions between them would lack rates for."""
+        currencies = set(currencies)
+        if len(currencies) < 2:
+            return []
+        return sorted(c for c in currencies if not self.supports(c))
+
+    def rate(self, currency: str, day: date) -> Decimal:
+        """Units of `currency` per pivot unit on `day` (the earliest known rate before the table starts).
+
+        Raises MissingRateError if the table has no rates for `currency`.
+        """
+        if currency == self.pivot:
+            return Decimal(1)
+        try:
+            days = self._days[currency]
+        except KeyError:
+            raise MissingRateError(f"No exchange rate for {currency}") from None
+        i = bisect.bisect_right(days, day.toordinal()) - 1
+        return self._rates[currency][max(i, 0)]
+
+    def month_rate(self, currency: str, year: int, month: int) -> Decimal:
+        """Average of the rates dated within a month, or the rate in effect at its end."""
+        if currency == self.pivot:
+            return Decimal(1)
+        key = (currency, year, month)
+        if key not in self._month_rates:
+            self._month_rates[key] = self._average(currency, year, month)
+        return self._month_rates[key]
+
+    def _average(self, currency: str, year: int, month: int) -> Decimal:
+        first = date(year, month, 1)
+        last = date(year + month // 12, month % 12 + 1, 1)
+        days = self._days.get(currency)
+        if days:
+            lo = bisect.bisect_left(days, first.toordinal())
+            hi = bisect.bisect_left(days, last.toordinal())
+            if hi > lo:
+                return sum(self._rates[currency][lo:hi]) / (hi - lo)
+        return self.rate(currency, date.fromordinal(last.toordinal() - 1))
+
+    def factor(self, source: str, target: str, rate: Callable[[str], Decimal]) -> tuple[int, int]:
+        """Exact (numerator, denominator) multiplier taking minor units of
+        `source` to minor units of `target`."""
+        t_num, t_den = rate(target).as_integer_ratio()
+        s_num, s_den = rate(source).as_integer_ratio()
+        num, den = t_num * s_den, t_den * s_num
+        shift = minor_exponent(target) - minor_exponent(source)
+        return (num * 10**shift, den) if shift >= 0 else (num, den * 10**-shift)
+
+    def _convert(
+        self,
+        amounts: Sequence[int],
+        currencies: Sequence[str],
+        periods: Sequence[Hashable],
+        target: str,
+        rate: Callable[[str, Hashable], Decimal],
+    ) -> list[int]:
+        # (2 * numerator, 2 * denominator) per key, for rounding half away from zero
+        factors: dict[tuple[str, Hashable], tuple[int, int]] = {}
+        for key in set(zip(currencies, periods)):
+            if key[0] != target:
+                num, den = self.factor(key[0], target, lambda c: rate(c, key[1]))
+                factors[key] = (2 * num, 2 * den)
+        if not factors:
+            return list(amounts)
+        out = []
+        for amount, currency, period in zip(amounts, currencies, periods):
+            if currency == target:
+                out.append(amount)
+                continue
+            num, den = factors[currency, period]
+            q = (abs(amount) * num + den // 2) // den
+            out.append(q if amount >= 0 else -q)
+        return out
+
+    def convert_many(
+        self, amounts: Sequence[int], currencies: Sequence[str], days: Sequence[date], target: str
+    ) -> list[int]:
+        """Convert minor-unit amounts to `target` at each amount's daily rate."""
+        return self._convert(amounts, currencies, days, target, self.rate)
+
+    def convert_monthly(
+        self,
+        amounts: Sequence[int],
+        currencies: Sequence[str],
+        months: Sequence[tuple[int, int]],
+        target: str,
+    ) -> list[int]:
+        """Convert monthly totals (e.g. rollup buckets) at each (year, month)'s average rate."""
+        return self._convert(amounts, currencies, months, target, lambda c, m: self.month_rate(c, *m))
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self._rates.values())
+
+
+# Global rate table instance
+rate_table = RateTable(get_settings().FX_PIVOT_CURRENCY)
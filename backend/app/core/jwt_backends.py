@@ -0,0 +1,173 @@
+"""Interchangeable JWT encode/verify implementations.
+
+All backends produce and accept the same compact HS256/384/512 tokens, so
+JWT_BACKEND can be switched without invalidating issued tokens. Each backend
+is built once with its key material prepared up front.
+"""
+
+import base64
+import calendar
+import hashlib
+import hmac
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any
+
+import orjson
+
+HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+class InvalidTokenError(Exception):
+    """Token is malformed, has a bad signature, or is expired."""
+
+
+def _timestamps(claims: dict[str, Any]) -> dict[str, Any]:
+    """Convert datetime exp/iat/nbf claims to integer UTC timestamps."""
+    out = dict(claims)
+    for key in ("exp", "iat", "nbf"):
+        if isinstance(out.get(key), datetime):
+            out[key] = calendar.timegm(out[key].utctimetuple())
+    return out
+
+
+class JWTBackend(ABC):
+    """Encodes claims and verifies tokens with one secret and algorithm."""
+
+    name = ""
+
+    def __init__(self, secret: str, algorithm: str) -> None:
+        self.secret = secret
+        self.algorithm = algorithm
+
+    @abstractmethod
+    def encode(self, claims: dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, token: str) -> dict[str, Any]:
+        """Return the verified claims or raise InvalidTokenError."""
+        raise NotImplementedError
+
+
+class JoseBackend(JWTBackend):
+    """python-jose (the original implementation)."""
+
+    name = "jose"
+
+    def __init__(self, secret: str, algorithm: str) -> None:
+        from jose import jwt
+
+        super().__init__(secret, algorithm)
+        self._jwt = jwt
+        self._algorithms = [algorithm]
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return self._jwt.encode(claims, self.secret, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict[str, Any]:
+        from jose import JWTError
+
+        try:
+            return self._jwt.decode(token, self.secret, algorithms=self._algorithms)
+        except JWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+class PyJWTBackend(JWTBackend):
+    """PyJWT (optional dependency: pip install pyjwt)."""
+
+    name = "pyjwt"
+
+    def __init__(self, secret: str, algorithm: str) -> None:
+        try:
+            import jwt
+        except ImportError as e:
+            raise RuntimeError("JWT_BACKEND=pyjwt requires the pyjwt package") from e
+        if not hasattr(jwt, "PyJWT"):
+            raise RuntimeError("The installed 'jwt' module is not PyJWT")
+        super().__init__(secret, algorithm)
+        self._jwt = jwt
+        self._algorithms = [algorithm]
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return self._jwt.encode(claims, self.secret, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            return self._jwt.decode(token, self.secret, algorithms=self._algorithms)
+        except self._jwt.PyJWTError as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HMACBackend(JWTBackend):
+    """Minimal stdlib HS* implementation: one keyed HMAC prepared at startup
+    and copied per token, orjson for the JSON segments."""
+
+    name = "hmac"
+
+    def __init__(self, secret: str, algorithm: str) -> None:
+        if algorithm not in HMAC_DIGESTS:
+            raise RuntimeError(f"JWT_BACKEND=hmac supports {', '.join(HMAC_DIGESTS)}, not {algorithm}")
+        super().__init__(secret, algorithm)
+        self._mac = hmac.new(secret.encode(), digestmod=HMAC_DIGESTS[algorithm])
+        self._header = _b64encode(orjson.dumps({"alg": algorithm, "typ": "JWT"}))
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        signing_input = self._header + b"." + _b64encode(orjson.dumps(_timestamps(claims)))
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode()
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            raw = token.encode("ascii")
+            signing_input, _, signature = raw.rpartition(b".")
+            header_b64, _, payload_b64 = signing_input.partition(b".")
+            if not header_b64 or not payload_b64 or b"." in payload_b64:
+                raise InvalidTokenError("Malformed token")
+            if header_b64 != self._header and orjson.loads(_b64decode(header_b64)).get("alg") != self.algorithm:
+                raise InvalidTokenError("Unexpected algorithm")
+            if not hmac.compare_digest(_b64decode(signature), self._sign(signing_input)):
+                raise InvalidTokenError("Signature verification failed")
+            claims = orjson.loads(_b64decode(payload_b64))
+        except (ValueError, UnicodeError, AttributeError) as e:
+            raise InvalidTokenError("Malformed token") from e
+        if not isinstance(claims, dict):
+            raise InvalidTokenError("Malformed token")
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None and (not isinstance(exp, (int, float)) or exp < now):
+            raise InvalidTokenError("Signature has expired")
+        nbf = claims.get("nbf")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+            raise InvalidTokenError("Token not yet valid")
+        return claims
+
+
+JWT_BACKENDS: dict[str, type[JWTBackend]] = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend,
+    HMACBackend.name: HMACBackend,
+}
+
+
+def make_backend(name: str, secret: str, algorithm: str) -> JWTBackend:
+    """Instantiate the backend registered under `name`."""
+    try:
+        backend_cls = JWT_BACKENDS[name]
+    except KeyError:
+        raise RuntimeError(f"Unknown JWT_BACKEND {name!r}; choose from {', '.join(JWT_BACKENDS)}") from None
+    return backend_cls(secret, algorithm)
@@ -0,0 +1,233 @@
+"""In-process Prometheus metrics: counters, gauges and pre-bucketed histograms.
+
+Observations are plain list/dict updates with no locks. They happen on the
+event loop, apart from pool events, which come from Motor's executor threads.
+Under heavy thread contention an increment can be lost, which is acceptable
+for monitoring. The text exposition format is only built when /metrics is
+scraped.
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+from app.core.context import route_template
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter:
+    """Monotonic counter, one series per label tuple."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Gauge(Counter):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: tuple = ()) -> None:
+        self._values[labels] = value
+
+
+class CallbackMetric:
+    """Unlabelled value read from a callback at scrape time (e.g. a queue
+    length or a counter some other component already keeps)."""
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float], kind: str = "gauge") -> None:
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.kind = kind
+
+    def samples(self) -> Iterable[str]:
+        yield f"{self.name} {self.fn()}"
+
+
+class Histogram:
+    """Fixed-bucket histogram. Each series is a list of per-bucket counts
+    (the last slot is +Inf) followed by the running sum."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+        labelnames: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = labelnames
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, series in list(self._series.items()):
+            series = list(series)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            suffix = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{suffix} {series[-1]}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class MetricsRegistry:
+    """Holds metrics in registration order and renders the exposition text."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, object] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def callback_gauge(self, name: str, help: str, fn: Callable[[], float]) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, fn, "gauge"))
+
+    def callback_counter(self, name: str, help: str, fn: Callable[[], float]) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, fn, "counter"))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+        labelnames: tuple[str, ...] = (),
+    ) -> Histogram:
+        return self.register(Histogram(name, help, buckets, labelnames))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template, method and status.",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    LATENCY_BUCKETS, ("method", "route"),
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+mongo_pool_checkout_wait = registry.histogram(
+    "mongo_pool_checkout_wait_seconds", "Time spent waiting to check a connection out of the Motor pool.",
+    WAIT_BUCKETS,
+)
+mongo_pool_checkout_failures = registry.counter(
+    "mongo_pool_checkout_failures_total", "Failed pool checkouts by reason.", ("reason",),
+)
+mongo_pool_checked_out = registry.gauge(
+    "mongo_pool_connections_checked_out", "Connections currently checked out of the pool.",
+)
+
+password_hash_wait = registry.histogram(
+    "password_hash_queue_wait_seconds", "Time bcrypt operations wait for a hashing slot.",
+    WAIT_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording in-flight requests, latency and status per route.
+
+    Routes are labelled by their template (scope["route"], set by routing) so
+    path parameters do not create new series; unmatched paths share one label.
+
+    Event streams (text/event-stream) stay open for as long as the client
+    listens. For them the latency is the time until the response starts,
+    and they leave the in-flight gauge at that point; open streams are
+    counted by event_subscribers instead.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        in_flight = True
+        elapsed = None
+
+        async def send_with_status(message) -> None:
+            nonlocal status, in_flight, elapsed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if content_type.startswith(b"text/event-stream"):
+                    elapsed = time.perf_counter() - start
+                    http_in_flight.dec()
+                    in_flight = False
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if elapsed is None:
+                elapsed = time.perf_counter() - start
+            if in_flight:
+                http_in_flight.dec()
+            route = route_template(scope) or "unmatched"
+            method = scope["method"]
+            http_request_duration.observe(elapsed, (method, route))
+            http_requests.inc((method, route, status))
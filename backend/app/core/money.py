@@ -0,0 +1,80 @@
+"""Money helpers: amounts are stored as integer minor units (e.g. cents).
+
+Decimal amounts only exist at the API edge. Requests are converted with
+to_minor, and responses with from_minor (or format_minor for text exports).
+"""
+
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from bson import Decimal128
+
+from app.core.config import get_settings
+
+# ISO 4217 currencies whose minor unit is not 1/100
+CURRENCY_EXPONENTS = {
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0, "KRW": 0,
+    "PYG": 0, "RWF": 0, "UGX": 0, "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+}
+
+# Largest stored amount. Floats stay exact (< 2**53), and Int64 sums of
+# many such amounts do not overflow.
+MAX_MINOR_UNITS = 10**15
+
+
+def default_currency() -> str:
+    return get_settings().DEFAULT_CURRENCY
+
+
+def minor_exponent(currency: str) -> int:
+    """Number of decimal places in one unit of `currency` (2 unless listed)."""
+    return CURRENCY_EXPONENTS.get(currency, 2)
+
+
+def to_minor(amount: Decimal | int | str, currency: str) -> int:
+    """Exact conversion of a decimal amount to minor units.
+
+    Raises ValueError if the amount has more decimal places than the currency
+    allows, or is larger than MAX_MINOR_UNITS minor units.
+    """
+    exponent = minor_exponent(currency)
+    try:
+        scaled = Decimal(amount).scaleb(exponent)
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f"Invalid amount: {amount!r}") from None
+    if not scaled.is_finite() or scaled != scaled.to_integral_value():
+        raise ValueError(f"{currency} amounts have at most {exponent} decimal places")
+    if abs(scaled) > MAX_MINOR_UNITS:
+        raise ValueError(f"Amount too large: {amount}")
+    return int(scaled)
+
+
+def legacy_to_minor(amount: float, currency: str) -> int:
+    """Round a legacy float amount (major units) to the nearest minor unit, halves up."""
+    scaled = Decimal(repr(amount)).scaleb(minor_exponent(currency))
+    return int(scaled.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_minor(minor: int, currency: str) -> float:
+    """Minor units back to a JSON number (exact for any realistic amount)."""
+    return minor / 10 ** minor_exponent(currency)
+
+
+def format_minor(minor: int, currency: str) -> str:
+    """Minor units as a fixed-point string, e.g. 1234 USD -> "12.34"."""
+    exponent = minor_exponent(currency)
+    return str(Decimal(minor).scaleb(-exponent).quantize(Decimal(1).scaleb(-exponent)))
+
+
+def legacy_minor_expr(field: str, factor: int) -> dict:
+    """Aggregation expression for integer minor units during the amounts
+    migration: `<field>_minor` plus the legacy float `<field>` (major units,
+    rounded). Documents carry one or the other, except rollup buckets, which
+    may hold both until they are rebuilt."""
+    # $toDecimal keeps the double's 15 significant digits (1.005 -> 1.00500000000000),
+    # as Decimal(repr(x)) does. Scaling the double itself would round 1.005 * 100
+    # to 100.49999999999999. Amounts are positive, so truncating x + 0.5 rounds
+    # half up, as legacy_to_minor does.
+    decimal = {"$toDecimal": {"$ifNull": [f"${field}", 0]}}
+    legacy = {"$toLong": {"$add": [{"$multiply": [decimal, factor]}, Decimal128("0.5")]}}
+    return {"$add": [{"$ifNull": [f"${field}_minor", 0]}, legacy]}
@@ -0,0 +1,35 @@
+"""Opaque keyset pagination cursors."""
+
+import base64
+import json
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+
+def encode_cursor(sort_value: datetime | str, doc_id: ObjectId) -> str:
+    """Encode a (sort value, _id) position as an opaque URL-safe token.
+
+    A string sort value (a legacy string date) is kept as a string, so the
+    position compares against documents of the same BSON type.
+    """
+    if isinstance(sort_value, str):
+        data = {"s": sort_value, "id": str(doc_id)}
+    else:
+        if sort_value.tzinfo is None:
+            sort_value = sort_value.replace(tzinfo=timezone.utc)
+        data = {"d": sort_value.isoformat(), "id": str(doc_id)}
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime | str, ObjectId]:
+    """Decode a cursor token. Raises ValueError if it is malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if "s" in data:
+            return str(data["s"]), ObjectId(data["id"])
+        return datetime.fromisoformat(data["d"]), ObjectId(data["id"])
+    except Exception as e:
+        raise ValueError("Invalid pagination cursor") from e
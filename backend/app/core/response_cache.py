@@ -0,0 +1,173 @@
+"""Versioned response cache with ETag support.
+
+Cached responses are keyed by group, endpoint name, query params and the
+group's current version number. Writes bump the version, which makes every
+older entry unreachable (they age out of the LRU) and changes the ETag.
+"""
+
+import hashlib
+import json
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import Request, Response, status
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.responses import dumps
+
+
+class CacheBackend(ABC):
+    """Async key-value store for cached responses; a Redis client can implement this."""
+
+    # ETags embed the namespace so versions from unshared stores never collide
+    namespace: str = "shared"
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Return the stored value or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value that expires after ttl seconds."""
+
+    @abstractmethod
+    async def get_version(self, key: str) -> int:
+        """Current value of a counter (0 if unset)."""
+
+    @abstractmethod
+    async def incr_version(self, key: str) -> int:
+        """Atomically increment a counter and return the new value."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop all cached values (version counters are kept)."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process LRU backend (the default)."""
+
+    def __init__(self, maxsize: int = 4096, max_versions: int | None = None) -> None:
+        self.namespace = uuid.uuid4().hex[:8]
+        self._entries = TTLCache(maxsize=maxsize)
+        # A single forgotten version could resurrect entries and ETags keyed by
+        # old ones, so counters are only ever dropped all at once (see _reset)
+        self._versions: dict[str, int] = {}
+        self.max_versions = 4 * maxsize if max_versions is None else max_versions
+
+    def _reset(self) -> None:
+        """Forget every version, cached entry and ETag (a new namespace)."""
+        self.namespace = uuid.uuid4().hex[:8]
+        self._entries.clear()
+        self._versions.clear()
+
+    async def get(self, key: str) -> Any | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    async def get_version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    async def incr_version(self, key: str) -> int:
+        if key not in self._versions and len(self._versions) >= self.max_versions:
+            self._reset()
+        self._versions[key] = self._versions.get(key, 0) + 1
+        return self._versions[key]
+
+
+class ResponseCache:
+    """Caches rendered JSON responses per group and serves 304s from the version."""
+
+    def __init__(self, backend: CacheBackend, ttl: float = 60.0) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    async def bump(self, group_id: str) -> None:
+        """Invalidate every cached response for a group."""
+        await self.backend.incr_version(f"version:{group_id}")
+
+    async def version(self, group_id: str) -> int:
+        """A group's current version (changes after every write to the group)."""
+        return await self.backend.get_version(f"version:{group_id}")
+
+    async def respond(
+        self,
+        request: Request,
+        group_id: str,
+        name: str,
+        params: dict,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: bool = True,
+    ) -> Response:
+        """Return 304, a cached body, or compute, cache and return a fresh one.
+
+        Pass cacheable=False when `compute` may read data older than the
+        current version (e.g. from a lagging secondary). The response is
+        then computed every time and sent without an ETag, since storing it
+        under the version a write just bumped would serve stale data.
+        """
+        if not cacheable:
+            self.misses += 1
+            return Response(
+                content=dumps(await compute()),
+                media_type="application/json",
+                headers={"Cache-Control": "private, no-cache", "X-Cache": "BYPASS"},
+            )
+        version = await self.version(group_id)
+        params_key = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.blake2b(f"{name}:{params_key}".encode(), digest_size=8).hexdigest()
+        etag = f'W/"{self.backend.namespace}-{version}-{digest}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            self.not_modified += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        key = f"{name}:{group_id}:{version}:{digest}"
+        body = await self.backend.get(key)
+        if body is None:
+            self.misses += 1
+            body = dumps(await compute())
+            await self.backend.set(key, body, self.ttl)
+            headers["X-Cache"] = "MISS"
+        else:
+            self.hits += 1
+            headers["X-Cache"] = "HIT"
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        """Hit/miss/304 counters."""
+        return {"hits": self.hits, "misses": self.misses, "not_modified": self.not_modified}
+
+
+_settings = get_settings()
+
+# Global response cache instance
+response_cache = ResponseCache(
+    InMemoryCacheBackend(maxsize=_settings.RESPONSE_CACHE_MAX_SIZE),
+    ttl=_settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+metrics.registry.callback_counter(
+    "response_cache_hits_total", "Stats/categories responses served from cache.",
+    lambda: response_cache.hits,
+)
+metrics.registry.callback_counter(
+    "response_cache_misses_total", "Stats/categories responses computed.",
+    lambda: response_cache.misses,
+)
+metrics.registry.callback_counter(
+    "response_cache_not_modified_total", "Conditional requests answered with 304.",
+    lambda: response_cache.not_modified,
+)
@@ -0,0 +1,26 @@
+"""Fast JSON response rendering."""
+
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes with orjson (handles datetimes, dates and ObjectIds)."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson; the application's default response class."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
@@ -0,0 +1,71 @@
+"""In-memory revoked-session set, synced from Mongo.
+
+Access and refresh tokens carry a session id (`sid`). Checking it against
+this set is a dict lookup, so authenticated requests never need a round trip
+for revocation. Revocations made in this process apply immediately; ones
+made by other workers arrive on the next sync (REVOCATION_SYNC_SECONDS).
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Re-read this far behind the newest revocation seen, to tolerate clock skew
+# between workers writing revoked_at
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class RevocationList:
+    """Revoked session ids mapped to the time their last token expires."""
+
+    def __init__(self) -> None:
+        self._revoked: dict[str, datetime] = {}
+        self._synced_until: datetime | None = None
+        self.syncs = 0
+
+    def is_revoked(self, sid: str) -> bool:
+        return sid in self._revoked
+
+    def add(self, sid: str, expires_at: datetime) -> None:
+        self._revoked[sid] = expires_at
+
+    async def sync(self, repo) -> int:
+        """Pull revocations from a RevokedSessionRepository. Returns the number of new entries."""
+        since = None if self._synced_until is None else self._synced_until - SYNC_OVERLAP
+        docs = await repo.revoked_since(since)
+        added = 0
+        for doc in docs:
+            if doc["_id"] not in self._revoked:
+                added += 1
+            self._revoked[doc["_id"]] = doc["expires_at"]
+            if self._synced_until is None or doc["revoked_at"] > self._synced_until:
+                self._synced_until = doc["revoked_at"]
+        if self._synced_until is None:
+            self._synced_until = datetime.utcnow()
+        self._prune()
+        self.syncs += 1
+        return added
+
+    def _prune(self) -> None:
+        now = datetime.utcnow()
+        expired = [sid for sid, expires_at in self._revoked.items() if expires_at < now]
+        for sid in expired:
+            del self._revoked[sid]
+
+    async def run(self, repo, interval: float) -> None:
+        """Sync forever; cancelled at shutdown."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync(repo)
+            except Exception:
+                logger.exception("Revoked session sync failed")
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+# Global revocation list instance
+revocation_list = RevocationList()
@@ -1,12 +1,18 @@
 """JWT and password security utilities."""
 
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 
-from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core import metrics
+from app.core.cache import TTLCache
 from app.core.config import get_settings
+from app.core.jwt_backends import InvalidTokenError, JWTBackend, make_backend
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -21,33 +27,186 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(subject: str | Any, expires_delta: timedelta | None = None) -> str:
-    """Create JWT access token."""
+class PasswordHasher:
+    """Runs bcrypt hashing/verification in a bounded thread pool.
+
+    At most PASSWORD_HASH_MAX_CONCURRENCY operations are submitted to the pool
+    at once; further callers wait on a semaphore and are counted as queued.
+    """
+
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.max_queued = 0
+
+    def _ensure_started(self) -> None:
+        if self._executor is None:
+            settings = get_settings()
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="bcrypt",
+            )
+            self._semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_MAX_CONCURRENCY)
+
+    async def _run(self, fn, *args):
+        self._ensure_started()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        start = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        metrics.password_hash_wait.observe(time.perf_counter() - start)
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash without blocking the event loop."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await self._run(get_password_hash, password)
+
+    def stats(self) -> dict:
+        """Queue depth and throughput counters."""
+        return {
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "max_queued": self.max_queued,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._semaphore = None
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher()
+
+metrics.registry.callback_gauge(
+    "password_hash_queue_depth", "bcrypt operations waiting for a hashing slot.",
+    lambda: password_hasher.queued,
+)
+metrics.registry.callback_gauge(
+    "password_hash_running", "bcrypt operations running in the thread pool.",
+    lambda: password_hasher.running,
+)
+
+
+class TokenVerifier:
+    """Encodes and verifies JWTs with a backend built once from settings.
+
+    Verified payloads are cached in a bounded LRU keyed by a hash of the
+    token and expire with the token's own `exp`, so a repeat request skips
+    signature verification and JSON parsing. Only tokens that verified are
+    cached. Cached payloads are shared; treat them as read-only.
+    """
+
+    def __init__(self, backend: JWTBackend | None = None) -> None:
+        self._backend = backend
+        self._cache: TTLCache | None = None
+
+    @property
+    def backend(self) -> JWTBackend:
+        if self._backend is None or self._cache is None:
+            settings = get_settings()
+            if self._backend is None:
+                self._backend = make_backend(
+                    settings.JWT_BACKEND, settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM
+                )
+            self._cache = TTLCache(maxsize=settings.JWT_CACHE_MAX_SIZE)
+        return self._backend
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return self.backend.encode(claims)
+
+    def decode(self, token: str) -> dict | None:
+        """Verified claims, or None if the token is invalid or expired."""
+        backend = self.backend
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        payload = self._cache.get(key)
+        if payload is not None:
+            return payload
+        try:
+            payload = backend.decode(token)
+        except InvalidTokenError:
+            return None
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            self._cache.set(key, payload, ttl=exp - time.time())
+        return payload
+
+    def reset(self) -> None:
+        """Drop the backend and cache; the next call rebuilds them from settings."""
+        self._backend = None
+        self._cache = None
+
+    def stats(self) -> dict:
+        """Cache size and hit/miss counters."""
+        if self._cache is None:
+            return {"size": 0, "hits": 0, "misses": 0}
+        return self._cache.stats()
+
+
+# Global token verifier instance
+token_verifier = TokenVerifier()
+
+metrics.registry.callback_counter(
+    "jwt_cache_hits_total", "Access/refresh tokens verified from cache.",
+    lambda: token_verifier.stats()["hits"],
+)
+metrics.registry.callback_counter(
+    "jwt_cache_misses_total", "Tokens that needed full verification.",
+    lambda: token_verifier.stats()["misses"],
+)
+
+
+def create_access_token(
+    subject: str | Any, expires_delta: timedelta | None = None, sid: str | None = None
+) -> str:
+    """Create JWT access token, tied to session `sid` when given."""
     settings = get_settings()
     expire = datetime.utcnow() + (
         expires_delta or timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    if sid is not None:
+        to_encode["sid"] = sid
+    return token_verifier.encode(to_encode)
 
 
-def create_refresh_token(subject: str | Any) -> str:
-    """Create JWT refresh token."""
+def create_refresh_token(
+    subject: str | Any,
+    sid: str | None = None,
+    jti: str | None = None,
+    expires_at: datetime | None = None,
+) -> str:
+    """Create JWT refresh token. `jti` identifies it in the refresh token store."""
     settings = get_settings()
-    expire = datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+    expire = expires_at or datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    if sid is not None:
+        to_encode["sid"] = sid
+    if jti is not None:
+        to_encode["jti"] = jti
+    return token_verifier.encode(to_encode)
 
 
 def decode_token(token: str) -> dict | None:
     """Decode and validate JWT token. Returns payload or None if invalid."""
-    try:
-        settings = get_settings()
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        return payload
-    except JWTError:
-        return None
+    return token_verifier.decode(token)
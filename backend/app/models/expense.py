@@ -1,10 +1,14 @@
 """Expense models."""
 
 from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
+from app.core.money import default_currency, from_minor, legacy_to_minor
 from app.models.base import BaseDBModel, PyObjectId
+from app.models.group import CURRENCY_PATTERN
 
 # Predefined expense categories (global)
 PREDEFINED_CATEGORIES = [
@@ -24,10 +28,13 @@ PREDEFINED_CATEGORIES = [
 
 class ExpenseBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
-    amount: float = Field(..., gt=0, description="Amount in currency units")
+    amount: Decimal = Field(..., gt=0, max_digits=18, description="Amount in currency units")
     category: str = Field(..., min_length=1, max_length=100)
     description: str = Field(default="", max_length=1000)
     date: date
+    currency: str | None = Field(
+        default=None, pattern=CURRENCY_PATTERN, description="ISO 4217 code (default: the group's base currency)"
+    )
 
 
 class ExpenseCreate(ExpenseBase):
@@ -36,21 +43,57 @@ class ExpenseCreate(ExpenseBase):
 
 class ExpenseInDB(BaseDBModel):
     title: str
-    amount: float
+    amount_minor: int  # integer minor units of `currency` (e.g. cents)
+    currency: str
     category: str
     description: str = ""
     date: date
     created_by: str  # user_id
     group_id: str
 
+    @model_validator(mode="before")
+    @classmethod
+    def _legacy_amount(cls, data: Any) -> Any:
+        """Accept documents not yet migrated from float `amount` (major units)."""
+        if isinstance(data, dict) and "amount_minor" not in data and "amount" in data:
+            data = dict(data)
+            data.setdefault("currency", default_currency())
+            data["amount_minor"] = legacy_to_minor(data.pop("amount"), data["currency"])
+        return data
+
 
 class Expense(BaseDBModel):
     id: PyObjectId | None = None
     title: str
     amount: float
+    currency: str
     category: str
     description: str = ""
     date: date
     created_by: str
     group_id: str
     created_at: datetime | None = None
+
+
+def expense_to_json(doc: dict) -> dict:
+    """Shape a raw expense document like the Expense response model, without Pydantic."""
+    expense_date = doc.get("date")
+    if isinstance(expense_date, datetime):
+        expense_date = expense_date.date()
+    if isinstance(expense_date, date):
+        expense_date = expense_date.isoformat()
+    currency = doc.get("currency") or default_currency()
+    amount_minor = doc.get("amount_minor")
+    return {
+        "id": str(doc["_id"]),
+        "created_at": doc.get("created_at"),
+        "updated_at": doc.get("updated_at"),
+        "title": doc.get("title"),
+        "amount": from_minor(amount_minor, currency) if amount_minor is not None else doc.get("amount"),
+        "currency": currency,
+        "category": doc.get("category"),
+        "description": doc.get("description", ""),
+        "date": expense_date,
+        "created_by": doc.get("created_by"),
+        "group_id": doc.get("group_id"),
+    }
@@ -3,10 +3,13 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
+from app.core.money import default_currency
 from app.models.base import BaseDBModel, PyObjectId
 
+CURRENCY_PATTERN = r"^[A-Z]{3}$"
+
 
 class MemberRole(str, Enum):
     ADMIN = "admin"
@@ -21,6 +24,10 @@ class GroupMember(BaseModel):
 class GroupBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     custom_categories: list[str] = Field(default_factory=list, max_length=20)
+    base_currency: str = Field(
+        default_factory=default_currency, pattern=CURRENCY_PATTERN,
+        description="ISO 4217 code that stats and balances are reported in",
+    )
 
 
 class GroupCreate(GroupBase):
@@ -32,6 +39,16 @@ class GroupInDB(BaseDBModel):
     created_by: str  # user_id
     members: list[dict] = Field(default_factory=list)  # [{user_id, role}]
     custom_categories: list[str] = Field(default_factory=list)
+    base_currency: str = Field(default_factory=default_currency)
+    expense_count: int | None = None  # None for legacy groups not yet backfilled
+
+    _member_roles: dict[str, str] | None = PrivateAttr(default=None)
+
+    def member_role(self, user_id: str) -> str | None:
+        """O(1) role lookup; the user_id -> role map is built once per instance."""
+        if self._member_roles is None:
+            self._member_roles = {m.get("user_id"): m.get("role") for m in self.members}
+        return self._member_roles.get(user_id)
 
 
 class Group(BaseDBModel):
@@ -40,4 +57,5 @@ class Group(BaseDBModel):
     created_by: str
     members: list[dict]
     custom_categories: list[str] = Field(default_factory=list)
+    base_currency: str
     created_at: datetime | None = None
@@ -0,0 +1,31 @@
+"""Settlement models."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.models.base import BaseDBModel, PyObjectId
+
+
+class SettlementCreate(BaseModel):
+    to_user: str = Field(..., description="User ID receiving the payment")
+    amount: float = Field(..., gt=0, description="Amount in currency units")
+    note: str = Field(default="", max_length=200)
+
+
+class SettlementInDB(BaseDBModel):
+    group_id: str
+    from_user: str  # user_id who paid
+    to_user: str  # user_id who received
+    amount: float
+    note: str = ""
+
+
+class Settlement(BaseDBModel):
+    id: PyObjectId | None = None
+    group_id: str
+    from_user: str
+    to_user: str
+    amount: float
+    note: str = ""
+    created_at: datetime | None = None
@@ -1,12 +1,50 @@
 """Expense repository for MongoDB operations."""
 
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 
-from bson import ObjectId
+from bson import Int64, ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from datetime import date, datetime, timezone
+from pymongo.errors import BulkWriteError
 
 from app.models.expense import ExpenseInDB
+from app.repositories.group_repository import GroupRepository
+from app.repositories.rollup_repository import ExpenseRollupRepository
+
+
+# Fields returned by the lean read path (matches the Expense response model)
+EXPENSE_PROJECTION = {
+    "title": 1,
+    "amount_minor": 1,
+    "currency": 1,
+    "amount": 1,  # legacy float, until migrated
+    "category": 1,
+    "description": 1,
+    "date": 1,
+    "created_by": 1,
+    "group_id": 1,
+    "created_at": 1,
+    "updated_at": 1,
+}
+
+
+# Text index over title/description, prefixed by group_id so searches stay
+# within one group (every $text query must then match group_id exactly)
+TEXT_INDEX_NAME = "expense_text"
+
+# (keys, options) for every expenses index; list_expenses filters follow
+# equality -> sort -> range, so each filter has an index with its equality
+# field before the (date, _id) sort keys
+EXPENSE_INDEXES = [
+    ([("group_id", 1), ("date", -1), ("_id", -1)], {}),
+    ([("group_id", 1), ("category", 1), ("date", -1), ("_id", -1)], {}),
+    ([("group_id", 1), ("created_by", 1), ("date", -1), ("_id", -1)], {}),
+    # Change feed: (updated_at, _id) watermark within a group
+    ([("group_id", 1), ("updated_at", 1), ("_id", 1)], {}),
+    (
+        [("group_id", 1), ("title", "text"), ("description", "text")],
+        {"name": TEXT_INDEX_NAME, "weights": {"title": 3, "description": 1}},
+    ),
+]
 
 
 class ExpenseRepository:
@@ -17,32 +55,233 @@ class ExpenseRepository:
     def __init__(self, db: AsyncIOMotorDatabase) -> None:
         self.db = db
         self.collection = db[self.COLLECTION]
+        self.rollups = ExpenseRollupRepository(db)
+        self.groups = GroupRepository(db)
 
-    async def create(self, expense: ExpenseInDB) -> ExpenseInDB:
-        """Create a new expense."""
+    async def ensure_indexes(self) -> None:
+        """Create the pagination, filter and text search indexes."""
+        for keys, options in EXPENSE_INDEXES:
+            await self.collection.create_index(keys, **options)
+
+    @staticmethod
+    def _to_document(expense: ExpenseInDB) -> dict:
         data = expense.model_dump(by_alias=True, exclude={"id", "_id"})
+        data["amount_minor"] = Int64(expense.amount_minor)
         # Serialize date for MongoDB
         data["date"] = datetime.combine(expense.date, datetime.min.time(), tzinfo=timezone.utc)
+        return data
+
+    async def create(self, expense: ExpenseInDB) -> ExpenseInDB:
+        """Create a new expense."""
+        # /changes assumes updated_at is set just before the write (see settled_position)
+        expense.updated_at = datetime.utcnow()
+        data = self._to_document(expense)
         result = await self.collection.insert_one(data)
         expense.id = result.inserted_id
+        await self.rollups.apply(
+            expense.group_id,
+            expense.date,
+            expense.category,
+            expense.created_by,
+            expense.amount_minor,
+            expense.currency,
+        )
+        await self.groups.increment_expense_count(expense.group_id)
         return expense
 
+    async def create_many(
+        self,
+        group_id: str,
+        expenses: list[ExpenseInDB],
+        ordered: bool = True,
+        chunk_size: int = 1000,
+    ) -> tuple[list[ExpenseInDB], dict[int, str]]:
+        """Insert expenses of one group in insert_many chunks.
+
+        Returns (inserted expenses, {index: error}). In ordered mode insertion
+        stops at the first failure. Rollups and the group counter are updated
+        once for the whole batch.
+        """
+        inserted: list[ExpenseInDB] = []
+        errors: dict[int, str] = {}
+        for offset in range(0, len(expenses), chunk_size):
+            chunk = expenses[offset:offset + chunk_size]
+            # Stamp each chunk as it is written: a long import must not leave
+            # later chunks dated before a /changes token that has moved past them
+            now = datetime.utcnow()
+            for expense in chunk:
+                expense.updated_at = now
+            docs = [self._to_document(e) for e in chunk]
+            failed: set[int] = set()
+            try:
+                await self.collection.insert_many(docs, ordered=ordered)
+            except BulkWriteError as e:
+                for err in e.details.get("writeErrors", []):
+                    failed.add(err["index"])
+                    errors[offset + err["index"]] = err.get("errmsg", "Insert failed")
+            for i, (expense, doc) in enumerate(zip(chunk, docs)):
+                # insert_many sets _id on each document it sent; in ordered
+                # mode nothing after the first failure was attempted
+                if i in failed or (ordered and failed and i > min(failed)):
+                    continue
+                expense.id = doc["_id"]
+                inserted.append(expense)
+            if ordered and failed:
+                break
+        if inserted:
+            await self.rollups.apply_many(group_id, inserted)
+            await self.groups.increment_expense_count(group_id, len(inserted))
+        return inserted, errors
+
+    def page_cursor(
+        self,
+        query: dict,
+        skip: int,
+        limit: int,
+        sort_order: int,
+        after: tuple[datetime | str, ObjectId] | None,
+        projection: dict | None = None,
+    ):
+        """Cursor for one page of `query` in (date, _id) order, optionally after a keyset position."""
+        query = dict(query)
+        if after is not None:
+            after_date, after_id = after
+            op = "$lt" if sort_order < 0 else "$gt"
+            branches = [
+                {"date": {op: after_date}},
+                {"date": after_date, "_id": {op: after_id}},
+            ]
+            # Until the date migration finishes, legacy string dates sort before
+            # BSON dates and range operators stay within one type, so crossing
+            # from one type's block to the other's takes its own branch
+            legacy = isinstance(after_date, str)
+            if legacy and sort_order > 0:
+                branches.append({"date": {"$type": "date"}})
+            elif not legacy and sort_order < 0:
+                branches.append({"date": {"$type": "string"}})
+            query["$or"] = branches
+            skip = 0
+        return (
+            self.collection.find(query, projection)
+            .sort([("date", sort_order), ("_id", sort_order)])
+            .skip(skip)
+            .limit(limit)
+        )
+
     async def get_by_group(
         self,
         group_id: str,
         skip: int = 0,
         limit: int = 20,
         sort_order: int = -1,
+        after: tuple[datetime | str, ObjectId] | None = None,
     ) -> list[ExpenseInDB]:
-        """Get expenses for a group with pagination and date sorting."""
+        """Get expenses for a group sorted by date (ties broken by _id).
+
+        With `after` (a (date, _id) position from a cursor), returns the page
+        following that position via an index range scan and ignores `skip`.
+        """
+        cursor = self.page_cursor({"group_id": group_id}, skip, limit, sort_order, after)
+        return [ExpenseInDB(**doc) async for doc in cursor]
+
+    async def get_by_group_raw(
+        self,
+        group_id: str,
+        skip: int = 0,
+        limit: int = 20,
+        sort_order: int = -1,
+        after: tuple[datetime | str, ObjectId] | None = None,
+        query: dict | None = None,
+    ) -> list[dict]:
+        """Same as get_by_group, but returns projected raw documents (no model construction).
+
+        `query` (from build_filter) narrows the page; it defaults to the whole group.
+        """
+        cursor = self.page_cursor(
+            query or {"group_id": group_id}, skip, limit, sort_order, after,
+            projection=EXPENSE_PROJECTION,
+        )
+        return await cursor.to_list(length=limit)
+
+    def build_filter(
+        self,
+        group_id: str,
+        start: date | None = None,
+        end: date | None = None,
+        categories: list[str] | None = None,
+        created_by: str | None = None,
+        min_amount: int | None = None,
+        max_amount: int | None = None,
+        search: str | None = None,
+        currency: str | None = None,
+    ) -> dict:
+        """Build a find filter for a group. Dates and amounts (minor units) are
+        inclusive ranges; `search` is a text search over title and description."""
+        query: dict = {"group_id": group_id}
+        date_range = {}
+        if start is not None:
+            date_range["$gte"] = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+        if end is not None:
+            date_range["$lt"] = datetime.combine(
+                end + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc
+            )
+        if date_range:
+            query["date"] = date_range
+        if categories:
+            query["category"] = {"$in": categories}
+        if created_by:
+            query["created_by"] = created_by
+        amount_range = {}
+        if min_amount is not None:
+            amount_range["$gte"] = min_amount
+        if max_amount is not None:
+            amount_range["$lte"] = max_amount
+        if amount_range:
+            query["amount_minor"] = amount_range
+        if currency:
+            query["currency"] = currency
+        if search:
+            query["$text"] = {"$search": search}
+        return query
+
+    def iter_raw(
+        self,
+        query: dict,
+        projection: dict | None = None,
+        batch_size: int = 1000,
+    ):
+        """Raw-document cursor sorted by (date, _id) for streaming; no model construction."""
+        return (
+            self.collection.find(query, projection)
+            .sort([("date", 1), ("_id", 1)])
+            .batch_size(batch_size)
+        )
+
+    async def changes_since(
+        self, group_id: str, after: tuple[datetime, ObjectId] | None, limit: int
+    ) -> list[dict]:
+        """Raw expenses created or modified after an (updated_at, _id) position, oldest first."""
+        query: dict = {"group_id": group_id}
+        if after is not None:
+            after_at, after_id = after
+            query["$or"] = [
+                {"updated_at": {"$gt": after_at}},
+                {"updated_at": after_at, "_id": {"$gt": after_id}},
+            ]
         cursor = (
-            self.collection.find({"group_id": group_id})
-            .sort("date", sort_order)
-            .skip(skip)
+            self.collection.find(query, EXPENSE_PROJECTION)
+            .sort([("updated_at", 1), ("_id", 1)])
             .limit(limit)
         )
-        return [ExpenseInDB(**doc) async for doc in cursor]
+        return await cursor.to_list(length=limit)
 
-    async def count_by_group(self, group_id: str) -> int:
-        """Count total expenses in a group."""
-        return await self.collection.count_documents({"group_id": group_id})
+    async def count_by_group(self, group_id: str, query: dict | None = None) -> int:
+        """Count expenses in a group, or those matching `query` (from build_filter)."""
+        return await self.collection.count_documents(query or {"group_id": group_id})
+
+    async def count_all_groups(self) -> dict[str, int]:
+        """Count expenses per group in one aggregation. Returns {group_id: count}."""
+        cursor = self.collection.aggregate(
+            [{"$group": {"_id": "$group_id", "count": {"$sum": 1}}}]
+        )
+        return {doc["_id"]: doc["count"] async for doc in cursor}
@@ -2,9 +2,31 @@
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.context import request_memo
+from app.core.events import event_broker, group_event
+from app.core.response_cache import response_cache
 from app.models.group import GroupInDB, MemberRole
 
+_settings = get_settings()
+
+# Process-wide group cache (membership, roles, categories), invalidated on writes
+group_cache = TTLCache(
+    maxsize=_settings.GROUP_CACHE_MAX_SIZE,
+    ttl=_settings.GROUP_CACHE_TTL_SECONDS,
+)
+metrics.registry.callback_counter(
+    "group_cache_hits_total", "Group cache hits.", lambda: group_cache.hits,
+)
+metrics.registry.callback_counter(
+    "group_cache_misses_total", "Group cache misses.", lambda: group_cache.misses,
+)
+metrics.registry.callback_gauge("group_cache_size", "Groups currently cached.", lambda: len(group_cache))
+
 
 class GroupRepository:
     """Handles group CRUD operations."""
@@ -23,9 +45,35 @@ class GroupRepository:
         return group
 
     async def get_by_id(self, group_id: str) -> GroupInDB | None:
-        """Get group by ID."""
-        doc = await self.collection.find_one({"_id": ObjectId(group_id)})
-        return GroupInDB(**doc) if doc else None
+        """Get group by ID, served from the request memo or group cache when possible."""
+        memo = request_memo()
+        key = ("group", group_id)
+        if memo is not None and key in memo:
+            return memo[key]
+        group = await self.get_cached(group_id)
+        if memo is not None:
+            memo[key] = group
+        return group
+
+    async def get_cached(self, group_id: str) -> GroupInDB | None:
+        """Get group by ID through the group cache only, for long-lived requests
+        (event streams) that must not see a copy memoized when they started."""
+        group = group_cache.get(group_id)
+        if group is None:
+            generation = group_cache.generation(group_id)
+            doc = await self.collection.find_one({"_id": ObjectId(group_id)})
+            group = GroupInDB(**doc) if doc else None
+            if group is not None:
+                group_cache.set(group_id, group, generation=generation)
+        return group
+
+    async def invalidate(self, group_id: str) -> None:
+        """Drop cached copies of a group and its cached responses after a write."""
+        group_cache.invalidate(group_id)
+        await response_cache.bump(group_id)
+        memo = request_memo()
+        if memo is not None:
+            memo.pop(("group", group_id), None)
 
     async def get_user_groups(self, user_id: str) -> list[GroupInDB]:
         """Get all groups where user is a member."""
@@ -34,6 +82,13 @@ class GroupRepository:
         ).sort("created_at", -1)
         return [GroupInDB(**doc) async for doc in cursor]
 
+    async def base_currencies(self) -> set[str]:
+        """Every group base currency in use (groups without one use DEFAULT_CURRENCY)."""
+        currencies = {value for value in await self.collection.distinct("base_currency") if value}
+        if await self.collection.count_documents({"base_currency": None}, limit=1):
+            currencies.add(get_settings().DEFAULT_CURRENCY)
+        return currencies
+
     async def add_member(self, group_id: str, user_id: str, role: str = "member") -> bool:
         """Add a member to a group."""
         result = await self.collection.update_one(
@@ -44,6 +99,9 @@ class GroupRepository:
                 }
             },
         )
+        await self.invalidate(group_id)
+        if result.modified_count:
+            event_broker.publish(group_id, "group_updated", group_event(["members"]))
         return result.modified_count > 0
 
     async def update_member_role(self, group_id: str, user_id: str, role: str) -> bool:
@@ -52,6 +110,9 @@ class GroupRepository:
             {"_id": ObjectId(group_id), "members.user_id": user_id},
             {"$set": {"members.$.role": role}},
         )
+        await self.invalidate(group_id)
+        if result.modified_count:
+            event_broker.publish(group_id, "group_updated", group_event(["members"]))
         return result.modified_count > 0
 
     async def remove_member(self, group_id: str, user_id: str) -> bool:
@@ -60,6 +121,9 @@ class GroupRepository:
             {"_id": ObjectId(group_id)},
             {"$pull": {"members": {"user_id": user_id}}},
         )
+        await self.invalidate(group_id)
+        if result.modified_count:
+            event_broker.publish(group_id, "group_updated", group_event(["members"], removed=user_id))
         return result.modified_count > 0
 
     async def add_custom_category(self, group_id: str, category: str) -> bool:
@@ -68,4 +132,35 @@ class GroupRepository:
             {"_id": ObjectId(group_id)},
             {"$addToSet": {"custom_categories": category}},
         )
+        await self.invalidate(group_id)
+        if result.modified_count:
+            event_broker.publish(group_id, "group_updated", group_event(["custom_categories"]))
         return result.modified_count > 0
+
+    async def increment_expense_count(self, group_id: str, n: int = 1) -> None:
+        """Adjust the cached expense counter. Legacy groups without one are left alone.
+
+        The cached group is updated rather than evicted, since every expense write lands here.
+        """
+        doc = await self.collection.find_one_and_update(
+            {"_id": ObjectId(group_id), "expense_count": {"$exists": True}},
+            {"$inc": {"expense_count": n}},
+            projection={"expense_count": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is not None:
+            count = doc["expense_count"]
+            group_cache.replace(group_id, lambda group: group.model_copy(update={"expense_count": count}))
+        # Cached responses cover the group's expenses, so they go stale either way
+        await response_cache.bump(group_id)
+        memo = request_memo()
+        if memo is not None:
+            memo.pop(("group", group_id), None)
+
+    async def set_expense_count(self, group_id: str, count: int) -> None:
+        """Overwrite the cached expense counter (used by backfills)."""
+        await self.collection.update_one(
+            {"_id": ObjectId(group_id)},
+            {"$set": {"expense_count": count}},
+        )
+        await self.invalidate(group_id)
@@ -0,0 +1,37 @@
+"""Migration state repository for MongoDB operations."""
+
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+class MigrationRepository:
+    """Tracks progress and completion of data migrations by name."""
+
+    COLLECTION = "migrations"
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.db = db
+        self.collection = db[self.COLLECTION]
+
+    async def is_complete(self, name: str) -> bool:
+        """Whether a migration has been marked complete."""
+        doc = await self.collection.find_one({"_id": name, "completed_at": {"$ne": None}})
+        return doc is not None
+
+    async def record_progress(self, name: str, processed: int) -> None:
+        """Add to the processed-document counter of a migration."""
+        await self.collection.update_one(
+            {"_id": name},
+            {"$inc": {"processed": processed}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    async def mark_complete(self, name: str) -> None:
+        """Mark a migration complete."""
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"_id": name},
+            {"$set": {"completed_at": now, "updated_at": now}},
+            upsert=True,
+        )
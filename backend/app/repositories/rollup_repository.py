@@ -0,0 +1,220 @@
+"""Expense rollup repository for pre-aggregated monthly stats."""
+
+from datetime import date
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.core.money import default_currency, legacy_minor_expr, minor_exponent
+from app.repositories.migration_repository import MigrationRepository
+
+# Rollup key: one document per (group, year, month, category, payer, currency)
+ROLLUP_KEY = ["group_id", "year", "month", "category", "created_by", "currency"]
+
+# Unique index from before buckets were split by currency; it would reject them
+LEGACY_ROLLUP_INDEX = "group_id_1_year_1_month_1_category_1_created_by_1"
+
+# Stale buckets deleted per delete_many after a rebuild
+REBUILD_DELETE_BATCH = 10000
+
+# Normalizes legacy string dates ("YYYY-MM-DD") to BSON dates inside pipelines
+DATE_OBJ_EXPR = {
+    "$cond": {
+        "if": {"$eq": [{"$type": "$date"}, "string"]},
+        "then": {"$dateFromString": {"dateString": {"$concat": ["$date", "T00:00:00Z"]}}},
+        "else": "$date",
+    }
+}
+
+
+class ExpenseRollupRepository:
+    """Maintains and queries the expense_rollups collection."""
+
+    COLLECTION = "expense_rollups"
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.db = db
+        self.collection = db[self.COLLECTION]
+
+    async def ensure_indexes(self) -> None:
+        """Create the unique bucket index (required by upserts and $merge)."""
+        if LEGACY_ROLLUP_INDEX in await self.collection.index_information():
+            await self.collection.drop_index(LEGACY_ROLLUP_INDEX)
+        await self.collection.create_index([(key, 1) for key in ROLLUP_KEY], unique=True)
+
+    async def apply(
+        self,
+        group_id: str,
+        expense_date: date,
+        category: str,
+        created_by: str,
+        amount_minor: int,
+        currency: str,
+        sign: int = 1,
+    ) -> None:
+        """Atomically add (sign=1) or remove (sign=-1) an expense from its rollup bucket."""
+        await self.collection.update_one(
+            {
+                "group_id": group_id,
+                "year": expense_date.year,
+                "month": expense_date.month,
+                "category": category,
+                "created_by": created_by,
+                "currency": currency,
+            },
+            {"$inc": {"total_minor": sign * amount_minor, "count": sign}},
+            upsert=True,
+        )
+
+    async def apply_many(self, group_id: str, expenses: list, sign: int = 1) -> None:
+        """Apply a batch of expenses with one $inc upsert per touched bucket."""
+        buckets: dict[tuple, list] = {}
+        for e in expenses:
+            key = (e.date.year, e.date.month, e.category, e.created_by, e.currency)
+            bucket = buckets.setdefault(key, [0, 0])
+            bucket[0] += e.amount_minor
+            bucket[1] += 1
+        if not buckets:
+            return
+        ops = [
+            UpdateOne(
+                {
+                    "group_id": group_id,
+                    "year": year,
+                    "month": month,
+                    "category": category,
+                    "created_by": created_by,
+                    "currency": currency,
+                },
+                {"$inc": {"total_minor": sign * total, "count": sign * count}},
+                upsert=True,
+            )
+            for (year, month, category, created_by, currency), (total, count) in buckets.items()
+        ]
+        await self.collection.bulk_write(ops, ordered=False)
+
+    async def get_buckets(
+        self, group_id: str, year: int | None = None, month: int | None = None
+    ) -> list[dict]:
+        """Monthly totals for a group in minor units, one per (month, category,
+        payer, currency), optionally narrowed to a year or month.
+
+        Buckets written before the currency split count as DEFAULT_CURRENCY
+        and are merged with their per-currency successors here.
+        """
+        match: dict = {"group_id": group_id}
+        if year is not None:
+            match["year"] = year
+        if month is not None:
+            match["month"] = month
+        factor = 10 ** minor_exponent(default_currency())
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": {
+                        "year": "$year",
+                        "month": "$month",
+                        "category": "$category",
+                        "created_by": "$created_by",
+                        "currency": {"$ifNull": ["$currency", default_currency()]},
+                    },
+                    "total": {"$sum": legacy_minor_expr("total", factor)},
+                }
+            },
+            {"$project": {"_id": 0, **{key: f"$_id.{key}" for key in ROLLUP_KEY[1:]}, "total": 1}},
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
+    async def currencies(self) -> set[str]:
+        """Every currency with rollup buckets (legacy buckets count as DEFAULT_CURRENCY)."""
+        currencies = {value for value in await self.collection.distinct("currency") if value}
+        if await self.collection.count_documents({"currency": None}, limit=1):
+            currencies.add(default_currency())
+        return currencies
+
+    async def totals_by_user(self, group_id: str) -> list[dict]:
+        """All-time amount paid per user in a group, in minor units, one
+        entry per (payer, currency, month) so each can be converted at its
+        month's rate."""
+        factor = 10 ** minor_exponent(default_currency())
+        pipeline = [
+            {"$match": {"group_id": group_id}},
+            {
+                "$group": {
+                    "_id": {
+                        "year": "$year",
+                        "month": "$month",
+                        "created_by": "$created_by",
+                        "currency": {"$ifNull": ["$currency", default_currency()]},
+                    },
+                    "total": {"$sum": legacy_minor_expr("total", factor)},
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    **{key: f"$_id.{key}" for key in ("year", "month", "created_by", "currency")},
+                    "total": 1,
+                }
+            },
+        ]
+        return await self.collection.aggregate(pipeline).to_list(length=None)
+
+    async def rebuild(self, group_id: str | None = None) -> int:
+        """Recompute rollups from the raw expenses collection. Returns bucket count.
+
+        Fresh buckets are merged over the existing ones in place, so stats read
+        during a rebuild never see a group without buckets. Buckets that existed
+        beforehand and were not rewritten (their key no longer has expenses, or
+        they predate the currency split) are deleted afterwards. Buckets created
+        by concurrent writes in the meantime are left alone.
+        """
+        match = {"group_id": group_id} if group_id else {}
+        build = ObjectId()
+        existing = [doc["_id"] async for doc in self.collection.find(match, {"_id": 1})]
+        # Once legacy string dates are migrated, $year/$month can read date directly
+        dates_normalized = await MigrationRepository(self.db).is_complete("expense_dates")
+        factor = 10 ** minor_exponent(default_currency())
+        pipeline = [
+            {"$match": match},
+            {"$addFields": {"dateObj": "$date" if dates_normalized else DATE_OBJ_EXPR}},
+            {
+                "$group": {
+                    "_id": {
+                        "group_id": "$group_id",
+                        "year": {"$year": "$dateObj"},
+                        "month": {"$month": "$dateObj"},
+                        "category": "$category",
+                        "created_by": "$created_by",
+                        "currency": {"$ifNull": ["$currency", default_currency()]},
+                    },
+                    "total_minor": {"$sum": legacy_minor_expr("amount", factor)},
+                    "count": {"$sum": 1},
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    **{key: f"$_id.{key}" for key in ROLLUP_KEY},
+                    "total_minor": 1,
+                    "count": 1,
+                    "build": build,
+                }
+            },
+            {
+                "$merge": {
+                    "into": self.COLLECTION,
+                    "on": ROLLUP_KEY,
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+        await self.db.expenses.aggregate(pipeline).to_list(length=None)
+        for i in range(0, len(existing), REBUILD_DELETE_BATCH):
+            await self.collection.delete_many(
+                {"_id": {"$in": existing[i:i + REBUILD_DELETE_BATCH]}, "build": {"$ne": build}}
+            )
+        return await self.collection.count_documents(match)
@@ -0,0 +1,47 @@
+"""Settlement repository for MongoDB operations."""
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.models.settlement import SettlementInDB
+
+
+class SettlementRepository:
+    """Handles recorded settlements (payments between members)."""
+
+    COLLECTION = "settlements"
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.db = db
+        self.collection = db[self.COLLECTION]
+
+    async def create(self, settlement: SettlementInDB) -> SettlementInDB:
+        """Record a settlement."""
+        data = settlement.model_dump(by_alias=True, exclude={"id", "_id"})
+        result = await self.collection.insert_one(data)
+        settlement.id = result.inserted_id
+        return settlement
+
+    async def get_by_group(self, group_id: str, limit: int = 100) -> list[SettlementInDB]:
+        """Most recent settlements for a group."""
+        cursor = self.collection.find({"group_id": group_id}).sort("created_at", -1).limit(limit)
+        return [SettlementInDB(**doc) async for doc in cursor]
+
+    async def net_by_user(self, group_id: str) -> dict[str, float]:
+        """Net amount each user has paid (+) or received (-) in settlements."""
+        pipeline = [
+            {"$match": {"group_id": group_id}},
+            {
+                "$facet": {
+                    "paid": [{"$group": {"_id": "$from_user", "total": {"$sum": "$amount"}}}],
+                    "received": [{"$group": {"_id": "$to_user", "total": {"$sum": "$amount"}}}],
+                }
+            },
+        ]
+        result = await self.collection.aggregate(pipeline).to_list(length=1)
+        net: dict[str, float] = {}
+        if result:
+            for doc in result[0]["paid"]:
+                net[doc["_id"]] = net.get(doc["_id"], 0) + doc["total"]
+            for doc in result[0]["received"]:
+                net[doc["_id"]] = net.get(doc["_id"], 0) - doc["total"]
+        return net
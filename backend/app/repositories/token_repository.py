@@ -0,0 +1,79 @@
+"""Refresh token and revoked session repositories for MongoDB operations."""
+
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+
+class RefreshTokenRepository:
+    """One document per issued refresh token (keyed by its jti).
+
+    A token is single-use: rotation marks it used and issues a successor in
+    the same session. Documents expire with the token via a TTL index.
+    """
+
+    COLLECTION = "refresh_tokens"
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.db = db
+        self.collection = db[self.COLLECTION]
+
+    async def ensure_indexes(self) -> None:
+        """TTL index on expiry."""
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def create(self, jti: str, sid: str, user_id: str, expires_at: datetime) -> None:
+        """Record a newly issued refresh token."""
+        await self.collection.insert_one(
+            {
+                "_id": jti,
+                "sid": sid,
+                "user_id": user_id,
+                "expires_at": expires_at,
+                "created_at": datetime.utcnow(),
+                "used_at": None,
+            }
+        )
+
+    async def mark_used(self, jti: str) -> dict | None:
+        """Atomically consume an unused token. Returns None if it was unknown or already used."""
+        return await self.collection.find_one_and_update(
+            {"_id": jti, "used_at": None},
+            {"$set": {"used_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+
+class RevokedSessionRepository:
+    """Revoked session ids, kept until the last token of the session has expired."""
+
+    COLLECTION = "revoked_sessions"
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.db = db
+        self.collection = db[self.COLLECTION]
+
+    async def ensure_indexes(self) -> None:
+        """TTL index on expiry, and revoked_at for incremental sync."""
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        await self.collection.create_index("revoked_at")
+
+    async def revoke(self, sid: str, user_id: str, expires_at: datetime, reason: str) -> datetime:
+        """Revoke a session. Returns the revocation time."""
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"_id": sid},
+            {
+                "$setOnInsert": {"user_id": user_id, "reason": reason, "revoked_at": now},
+                "$max": {"expires_at": expires_at},
+            },
+            upsert=True,
+        )
+        return now
+
+    async def revoked_since(self, since: datetime | None) -> list[dict]:
+        """Sessions revoked at or after `since` (all of them if None)."""
+        query = {} if since is None else {"revoked_at": {"$gte": since}}
+        cursor = self.collection.find(query, {"revoked_at": 1, "expires_at": 1})
+        return await cursor.to_list(length=None)
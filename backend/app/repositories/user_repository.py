@@ -20,6 +20,17 @@ class UserRepository:
         doc = await self.collection.find_one({"_id": ObjectId(user_id)})
         return UserInDB(**doc) if doc else None
 
+    async def get_many(self, user_ids: list[str]) -> dict[str, dict]:
+        """Get users by ID in one query. Returns {user_id: {"full_name": ...}}."""
+        object_ids = list({ObjectId(uid) for uid in user_ids if ObjectId.is_valid(uid)})
+        if not object_ids:
+            return {}
+        cursor = self.collection.find(
+            {"_id": {"$in": object_ids}},
+            {"full_name": 1},
+        )
+        return {str(doc["_id"]): doc async for doc in cursor}
+
     async def get_by_email(self, email: str) -> UserInDB | None:
         """Get user by email."""
         doc = await self.collection.find_one({"email": email.lower()})
@@ -1,15 +1,20 @@
 """Authentication business logic."""
 
+import uuid
+from datetime import datetime, timedelta
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.core.config import get_settings
+from app.core.revocation import revocation_list
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    get_password_hash,
-    verify_password,
+    password_hasher,
 )
 from app.models.user import User, UserCreate, UserInDB
+from app.repositories.token_repository import RefreshTokenRepository, RevokedSessionRepository
 from app.repositories.user_repository import UserRepository
 
 
@@ -18,6 +23,8 @@ class AuthService:
 
     def __init__(self, db: AsyncIOMotorDatabase) -> None:
         self.repo = UserRepository(db)
+        self.refresh_repo = RefreshTokenRepository(db)
+        self.revoked_repo = RevokedSessionRepository(db)
 
     async def register(self, user_create: UserCreate) -> User:
         """Register a new user."""
@@ -27,7 +34,7 @@ class AuthService:
         user_in_db = UserInDB(
             email=user_create.email.lower(),
             full_name=user_create.full_name,
-            hashed_password=get_password_hash(user_create.password),
+            hashed_password=await password_hasher.hash(user_create.password),
         )
         created = await self.repo.create(user_in_db)
         return User(
@@ -41,7 +48,7 @@ class AuthService:
     async def authenticate(self, email: str, password: str) -> User | None:
         """Authenticate user and return user if valid."""
         user = await self.repo.get_by_email(email)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await password_hasher.verify(password, user.hashed_password):
             return None
         if not user.is_active:
             return None
@@ -53,18 +60,49 @@ class AuthService:
             created_at=user.created_at,
         )
 
-    def create_tokens(self, user_id: str) -> tuple[str, str]:
-        """Create access and refresh tokens for a user."""
-        access = create_access_token(str(user_id))
-        refresh = create_refresh_token(str(user_id))
+    async def create_tokens(self, user_id: str, sid: str | None = None) -> tuple[str, str]:
+        """Create access and refresh tokens for a user, in a new session unless `sid` is given."""
+        settings = get_settings()
+        sid = sid or uuid.uuid4().hex
+        jti = uuid.uuid4().hex
+        expires_at = datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+        await self.refresh_repo.create(jti, sid, str(user_id), expires_at)
+        access = create_access_token(str(user_id), sid=sid)
+        refresh = create_refresh_token(str(user_id), sid=sid, jti=jti, expires_at=expires_at)
         return access, refresh
 
-    def refresh_access_token(self, refresh_token: str) -> str | None:
-        """Validate refresh token and return new access token."""
+    async def refresh_tokens(self, refresh_token: str) -> tuple[str, str] | None:
+        """Rotate a refresh token: consume it and return a new access/refresh pair.
+
+        Presenting a refresh token that was already used revokes its whole
+        session, since only a copy of a rotated token can be replayed.
+        """
         payload = decode_token(refresh_token)
         if payload is None or payload.get("type") != "refresh":
             return None
-        user_id = payload.get("sub")
-        if not user_id:
+        user_id, sid, jti = payload.get("sub"), payload.get("sid"), payload.get("jti")
+        if not user_id or not sid or not jti:
+            # Issued before rotation existed; the client has to log in again
+            return None
+        if revocation_list.is_revoked(sid):
+            return None
+        if await self.refresh_repo.mark_used(jti) is None:
+            await self.revoke_session(sid, user_id, reason="reuse")
             return None
-        return create_access_token(user_id)
+        return await self.create_tokens(user_id, sid=sid)
+
+    async def revoke_session(self, sid: str, user_id: str, reason: str = "logout") -> None:
+        """Revoke every access and refresh token of a session."""
+        settings = get_settings()
+        # Outlives any token the session can still hold
+        expires_at = datetime.utcnow() + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+        await self.revoked_repo.revoke(sid, user_id, expires_at, reason)
+        revocation_list.add(sid, expires_at)
+
+    async def logout(self, refresh_token: str) -> bool:
+        """End the session a refresh token belongs to. Returns False if the token is invalid."""
+        payload = decode_token(refresh_token)
+        if payload is None or payload.get("type") != "refresh" or not payload.get("sid"):
+            return False
+        await self.revoke_session(payload["sid"], payload["sub"])
+        return True
@@ -0,0 +1,79 @@
+"""Incremental expense change feed for delta sync."""
+
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import get_settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.expense import expense_to_json
+from app.repositories.expense_repository import ExpenseRepository
+
+# Sorts after every real _id at the same updated_at
+MAX_OBJECT_ID = ObjectId("f" * 24)
+
+Position = tuple[datetime, ObjectId]
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def settled_position() -> Position:
+    """Feed position that every write is assumed to have landed before.
+
+    updated_at is set by the writing worker before the insert, so a document
+    can become visible after others with a later updated_at. Tokens never
+    advance past now - CHANGES_SETTLE_SECONDS, so such a write is not skipped.
+    """
+    lag = timedelta(seconds=get_settings().CHANGES_SETTLE_SECONDS)
+    return datetime.utcnow() - lag, MAX_OBJECT_ID
+
+
+def sync_token() -> str:
+    """Token for "changes from about now on", handed out with expense pages."""
+    return encode_cursor(*settled_position())
+
+
+class ChangesService:
+    """Expenses created or modified since a token, in (updated_at, _id) order.
+
+    Delivery is at-least-once: items near the head of the feed may be
+    returned again by the next call, so clients apply them by id.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.repo = ExpenseRepository(db)
+
+    async def changes(self, group_id: str, since: str | None, limit: int = 100) -> dict:
+        """One batch of changes after `since` (from the beginning if None).
+
+        Raises ValueError for a malformed token.
+        """
+        after = None
+        if since is not None:
+            after_at, after_id = decode_cursor(since)
+            if not isinstance(after_at, datetime):
+                raise ValueError("Invalid sync token")
+            after = (_naive_utc(after_at), after_id)
+        docs = await self.repo.changes_since(group_id, after, limit + 1)
+        has_more = len(docs) > limit
+        docs = docs[:limit]
+
+        settled = settled_position()
+        position = settled
+        if has_more:
+            last = (_naive_utc(docs[-1]["updated_at"]), docs[-1]["_id"])
+            position = min(last, settled)
+            # The rest of the batch is too recent to page past; it comes with the next poll
+            has_more = last <= settled
+        if after is not None and position < after:
+            position = after
+        return {
+            "items": [expense_to_json(doc) for doc in docs],
+            "next": encode_cursor(*position),
+            "has_more": has_more,
+        }
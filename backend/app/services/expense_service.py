@@ -1,12 +1,33 @@
 """Expense business logic."""
 
+import csv
+import io
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
 
-from app.models.expense import ExpenseCreate, ExpenseInDB, PREDEFINED_CATEGORIES
+from app.core.events import event_broker
+from app.core.fx import rate_table
+from app.core.money import to_minor
+from app.models.expense import ExpenseCreate, ExpenseInDB, PREDEFINED_CATEGORIES, expense_to_json
+from app.models.group import GroupInDB
 from app.repositories.expense_repository import ExpenseRepository
 from app.repositories.group_repository import GroupRepository
 
 
+# Upper bound on rows accepted by a single bulk import request
+BULK_MAX_ROWS = 10000
+# Upper bound on a bulk import body, checked before it is parsed
+# (BULK_MAX_ROWS rows of about 1.5 KB at most, with room for formatting)
+BULK_MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+    )
+
+
 class ExpenseService:
     """Handles expense operations."""
 
@@ -18,6 +39,17 @@ class ExpenseService:
         """Combine predefined and group-specific categories."""
         return list(dict.fromkeys(PREDEFINED_CATEGORIES + custom_categories))
 
+    @staticmethod
+    def resolve_currency(group: GroupInDB, currency: str | None) -> str:
+        """The expense's currency (default: the group's base), which must be
+        convertible to the base currency."""
+        currency = currency or group.base_currency
+        if currency != group.base_currency and not (
+            rate_table.supports(currency) and rate_table.supports(group.base_currency)
+        ):
+            raise ValueError(f"No exchange rate from {currency} to {group.base_currency}")
+        return currency
+
     async def validate_category(
         self, group_id: str, category: str
     ) -> tuple[bool, str | None]:
@@ -37,13 +69,91 @@ class ExpenseService:
         valid, err = await self.validate_category(group_id, data.category)
         if not valid:
             raise ValueError(err or "Invalid category")
+        # Served from the request memo filled by validate_category
+        group = await self.group_repo.get_by_id(group_id)
+        currency = self.resolve_currency(group, data.currency)
         expense = ExpenseInDB(
             title=data.title,
-            amount=data.amount,
+            amount_minor=to_minor(data.amount, currency),
+            currency=currency,
             category=data.category,
             description=data.description,
             date=data.date,
             created_by=user_id,
             group_id=group_id,
         )
-        return await self.repo.create(expense)
+        expense = await self.repo.create(expense)
+        event_broker.publish(group_id, "expense_created", expense_to_json(expense.model_dump(by_alias=True)))
+        return expense
+
+    @staticmethod
+    def parse_csv(text: str) -> list[dict]:
+        """Parse CSV with a header row (title, amount, category, description, date)."""
+        reader = csv.DictReader(io.StringIO(text))
+        return [
+            {k.strip(): (v or "").strip() for k, v in row.items() if k is not None}
+            for row in reader
+        ]
+
+    async def bulk_create(
+        self,
+        group: GroupInDB,
+        user_id: str,
+        rows: list[dict],
+        ordered: bool = False,
+    ) -> dict:
+        """Validate rows once against the group's categories and insert the valid ones.
+
+        Returns {"inserted", "skipped", "errors": [{"row", "error"}]} where row
+        is the 0-based index in the input. In ordered mode nothing is inserted
+        if any row fails validation, and insertion stops at the first write error.
+        """
+        if len(rows) > BULK_MAX_ROWS:
+            raise ValueError(f"At most {BULK_MAX_ROWS} rows can be imported at once")
+        group_id = str(group.id)
+        allowed = set(self.get_valid_categories(group_id, group.custom_categories))
+        errors: dict[int, str] = {}
+        expenses: list[ExpenseInDB] = []
+        positions: list[int] = []
+        for i, row in enumerate(rows):
+            try:
+                data = ExpenseCreate.model_validate(row)
+            except ValidationError as e:
+                errors[i] = _format_validation_error(e)
+                continue
+            if data.category not in allowed:
+                errors[i] = f"Unknown category: {data.category}"
+                continue
+            try:
+                currency = self.resolve_currency(group, data.currency)
+                amount_minor = to_minor(data.amount, currency)
+            except ValueError as e:
+                errors[i] = str(e)
+                continue
+            expenses.append(
+                ExpenseInDB(
+                    title=data.title,
+                    amount_minor=amount_minor,
+                    currency=currency,
+                    category=data.category,
+                    description=data.description,
+                    date=data.date,
+                    created_by=user_id,
+                    group_id=group_id,
+                )
+            )
+            positions.append(i)
+
+        inserted: list[ExpenseInDB] = []
+        if expenses and not (ordered and errors):
+            inserted, write_errors = await self.repo.create_many(group_id, expenses, ordered=ordered)
+            for index, message in write_errors.items():
+                errors[positions[index]] = message
+        if inserted:
+            # One event for the batch; clients fetch the rows through /changes
+            event_broker.publish(group_id, "expenses_imported", {"count": len(inserted)})
+        return {
+            "inserted": len(inserted),
+            "skipped": len(rows) - len(inserted) - len(errors),
+            "errors": [{"row": i, "error": errors[i]} for i in sorted(errors)],
+        }
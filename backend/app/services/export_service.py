@@ -0,0 +1,171 @@
+"""Streaming expense export."""
+
+import csv
+import io
+import json
+import logging
+import zlib
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.fx import rate_table
+from app.core.money import default_currency, format_minor, legacy_to_minor
+from app.repositories.expense_repository import ExpenseRepository
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FIELDS = [
+    "id", "date", "title", "amount", "currency", "base_amount", "base_currency",
+    "category", "description", "created_by", "created_at",
+]
+EXPORT_PROJECTION = {
+    "date": 1,
+    "title": 1,
+    "amount_minor": 1,
+    "currency": 1,
+    "amount": 1,
+    "category": 1,
+    "description": 1,
+    "created_by": 1,
+    "created_at": 1,
+}
+
+# Flush the output buffer once it grows past this many bytes
+CHUNK_SIZE = 64 * 1024
+
+# Documents converted to the base currency together
+CONVERT_BATCH = 1000
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        # Expense dates are stored as midnight UTC; export them as plain dates
+        if value.hour == value.minute == value.second == value.microsecond == 0:
+            return value.date().isoformat()
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _minor_amount(doc: dict) -> tuple[int, str]:
+    """Amount in minor units and its currency."""
+    currency = doc.get("currency") or default_currency()
+    minor = doc.get("amount_minor")
+    if minor is None:
+        # Not yet migrated to minor units
+        minor = legacy_to_minor(doc.get("amount") or 0, currency)
+    return minor, currency
+
+
+def _expense_day(value) -> date:
+    if isinstance(value, str):  # legacy string date
+        return date.fromisoformat(value[:10])
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _to_row(doc: dict, minor: int, currency: str, base_minor: int | None, base_currency: str) -> dict:
+    row = {"id": str(doc["_id"])}
+    for field in EXPORT_FIELDS[1:]:
+        row[field] = _format_value(doc.get(field))
+    row["amount"], row["currency"] = format_minor(minor, currency), currency
+    # Left empty when there is no exchange rate for the expense's currency
+    row["base_amount"] = format_minor(base_minor, base_currency) if base_minor is not None else None
+    row["base_currency"] = base_currency
+    return row
+
+
+class ExpenseExportService:
+    """Streams a group's expenses as CSV or NDJSON with constant memory."""
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.repo = ExpenseRepository(db)
+
+    async def _rows(self, query: dict, base_currency: str) -> AsyncIterator[dict]:
+        batch: list[dict] = []
+        async for doc in self.repo.iter_raw(query, EXPORT_PROJECTION, batch_size=CONVERT_BATCH):
+            batch.append(doc)
+            if len(batch) >= CONVERT_BATCH:
+                for row in self._convert_batch(batch, base_currency):
+                    yield row
+                batch = []
+        for row in self._convert_batch(batch, base_currency):
+            yield row
+
+    @staticmethod
+    def _convert_batch(docs: list[dict], base_currency: str) -> list[dict]:
+        """Rows for a batch of documents, converted to the base currency at
+        each expense's date in one pass. Rows in currencies without exchange
+        rates get an empty base_amount rather than failing the export."""
+        amounts = [_minor_amount(doc) for doc in docs]
+        convertible = [i for i, (_, currency) in enumerate(amounts) if rate_table.can_convert(currency, base_currency)]
+        if len(convertible) < len(docs):
+            missing = {currency for _, currency in amounts} - {amounts[i][1] for i in convertible}
+            logger.warning("Exporting without base amounts for %s: no exchange rates", ", ".join(sorted(missing)))
+        converted = rate_table.convert_many(
+            [amounts[i][0] for i in convertible],
+            [amounts[i][1] for i in convertible],
+            [_expense_day(docs[i]["date"]) for i in convertible],
+            base_currency,
+        )
+        base: list[int | None] = [None] * len(docs)
+        for i, base_minor in zip(convertible, converted):
+            base[i] = base_minor
+        return [
+            _to_row(doc, minor, currency, base_minor, base_currency)
+            for doc, (minor, currency), base_minor in zip(docs, amounts, base)
+        ]
+
+    async def _csv(self, query: dict, base_currency: str) -> AsyncIterator[str]:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        async for row in self._rows(query, base_currency):
+            writer.writerow(row)
+            if buf.tell() >= CHUNK_SIZE:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+
+    async def _ndjson(self, query: dict, base_currency: str) -> AsyncIterator[str]:
+        parts: list[str] = []
+        size = 0
+        async for row in self._rows(query, base_currency):
+            line = json.dumps(row, separators=(",", ":")) + "\n"
+            parts.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                yield "".join(parts)
+                parts, size = [], 0
+        yield "".join(parts)
+
+    async def stream(
+        self,
+        group_id: str,
+        fmt: str = "csv",
+        start: date | None = None,
+        end: date | None = None,
+        categories: list[str] | None = None,
+        gzip: bool = False,
+        base_currency: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield encoded export chunks, optionally gzip-compressed on the fly.
+
+        Each row also carries its amount in `base_currency` (the group's),
+        converted at the expense date's rate.
+        """
+        base_currency = base_currency or default_currency()
+        query = self.repo.build_filter(group_id, start=start, end=end, categories=categories)
+        chunks = self._ndjson(query, base_currency) if fmt == "ndjson" else self._csv(query, base_currency)
+        compressor = zlib.compressobj(wbits=31) if gzip else None  # wbits=31: gzip container
+        async for text in chunks:
+            data = text.encode("utf-8")
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                yield data
+        if compressor is not None:
+            yield compressor.flush()
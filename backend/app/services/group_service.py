@@ -19,15 +19,14 @@ class GroupService:
             created_by=user_id,
             members=[{"user_id": user_id, "role": MemberRole.ADMIN.value}],
             custom_categories=data.custom_categories or [],
+            base_currency=data.base_currency,
+            expense_count=0,
         )
         return await self.repo.create(group)
 
     def get_member_role(self, group: GroupInDB, user_id: str) -> str | None:
         """Get a user's role in a group. Returns None if not a member."""
-        for m in group.members:
-            if m.get("user_id") == user_id:
-                return m.get("role")
-        return None
+        return group.member_role(user_id)
 
     def is_admin(self, group: GroupInDB, user_id: str) -> bool:
         """Check if user is admin of the group."""
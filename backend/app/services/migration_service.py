@@ -0,0 +1,169 @@
+"""Data migrations that can run in the background or from a command."""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from bson import Int64, ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.core.money import default_currency, legacy_to_minor
+from app.repositories.migration_repository import MigrationRepository
+
+logger = logging.getLogger(__name__)
+
+EXPENSE_DATES = "expense_dates"
+EXPENSE_AMOUNTS = "expense_amounts"
+
+LEGACY_DATE_FILTER = {"date": {"$type": "string"}}
+LEGACY_AMOUNT_FILTER = {"amount_minor": {"$exists": False}}
+
+
+def _parse_legacy_date(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value[:10]).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+async def _legacy_batch(
+    collection, query: dict, projection: dict, batch_size: int, after: ObjectId | None
+) -> list[dict]:
+    """Next batch of legacy documents in _id order, after `after`."""
+    if after is not None:
+        query = {**query, "_id": {"$gt": after}}
+    cursor = collection.find(query, projection).sort("_id", 1).limit(batch_size)
+    return await cursor.to_list(length=batch_size)
+
+
+class ExpenseDateMigration:
+    """Converts legacy string `date` fields on expenses to BSON dates.
+
+    Works in batches and only touches documents whose date is still a string,
+    so it can be interrupted and resumed (or run by several workers) safely.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.expenses = db.expenses
+        self.migrations = MigrationRepository(db)
+
+    async def remaining(self) -> int:
+        """Number of expenses still stored with a string date (0 once complete)."""
+        if await self.migrations.is_complete(EXPENSE_DATES):
+            return 0
+        return await self.expenses.count_documents(LEGACY_DATE_FILTER)
+
+    async def check(self) -> int:
+        """Like remaining(), but marks the migration complete when nothing is left
+        so later startups skip the collection scan."""
+        remaining = await self.remaining()
+        if remaining == 0:
+            await self.migrations.mark_complete(EXPENSE_DATES)
+        return remaining
+
+    async def run_batch(
+        self, batch_size: int = 1000, after: ObjectId | None = None
+    ) -> tuple[int, ObjectId | None]:
+        """Convert up to batch_size documents with _id above `after`.
+
+        Returns (documents converted, last _id examined), the latter None
+        once no documents are left. Unconvertible documents are skipped, and
+        paging by _id keeps them from being selected again.
+        """
+        docs = await _legacy_batch(self.expenses, LEGACY_DATE_FILTER, {"date": 1}, batch_size, after)
+        ops = []
+        for doc in docs:
+            parsed = _parse_legacy_date(doc["date"])
+            if parsed is None:
+                logger.warning("Expense %s has unparseable date %r", doc["_id"], doc["date"])
+                continue
+            # Guard on the old value so a concurrent edit is never overwritten
+            ops.append(UpdateOne({"_id": doc["_id"], "date": doc["date"]}, {"$set": {"date": parsed}}))
+        if ops:
+            await self.expenses.bulk_write(ops, ordered=False)
+            await self.migrations.record_progress(EXPENSE_DATES, len(ops))
+        return len(ops), docs[-1]["_id"] if docs else None
+
+    async def run(self, batch_size: int = 1000, pause: float = 0.0) -> int:
+        """Run batches over every legacy date once. Returns documents converted."""
+        converted, after = 0, None
+        while True:
+            n, after = await self.run_batch(batch_size, after)
+            converted += n
+            if after is None:
+                break
+            if pause:
+                await asyncio.sleep(pause)
+        if await self.check() == 0:
+            logger.info("Expense date migration complete (%d converted)", converted)
+        return converted
+
+
+class ExpenseAmountMigration:
+    """Converts legacy float `amount` fields on expenses to integer minor units.
+
+    Each document gets `amount_minor` (Int64, rounded half up) and a
+    `currency` (DEFAULT_CURRENCY), and loses `amount`. Batched and guarded on
+    the old value like ExpenseDateMigration, so it is safe to resume.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.expenses = db.expenses
+        self.migrations = MigrationRepository(db)
+
+    async def remaining(self) -> int:
+        """Number of expenses still stored with a float amount (0 once complete)."""
+        if await self.migrations.is_complete(EXPENSE_AMOUNTS):
+            return 0
+        return await self.expenses.count_documents(LEGACY_AMOUNT_FILTER)
+
+    async def check(self) -> int:
+        """Like remaining(), but marks the migration complete when nothing is left."""
+        remaining = await self.remaining()
+        if remaining == 0:
+            await self.migrations.mark_complete(EXPENSE_AMOUNTS)
+        return remaining
+
+    async def run_batch(
+        self, batch_size: int = 1000, after: ObjectId | None = None
+    ) -> tuple[int, ObjectId | None]:
+        """Convert up to batch_size documents with _id above `after`.
+        Returns (documents converted, last _id examined or None when done)."""
+        docs = await _legacy_batch(
+            self.expenses, LEGACY_AMOUNT_FILTER, {"amount": 1, "currency": 1}, batch_size, after
+        )
+        ops = []
+        for doc in docs:
+            currency = doc.get("currency") or default_currency()
+            amount = doc.get("amount")
+            if not isinstance(amount, (int, float)):
+                logger.warning("Expense %s has non-numeric amount %r", doc["_id"], amount)
+                continue
+            ops.append(
+                UpdateOne(
+                    {"_id": doc["_id"], "amount": amount, "amount_minor": {"$exists": False}},
+                    {
+                        "$set": {"amount_minor": Int64(legacy_to_minor(amount, currency)), "currency": currency},
+                        "$unset": {"amount": ""},
+                    },
+                )
+            )
+        if ops:
+            await self.expenses.bulk_write(ops, ordered=False)
+            await self.migrations.record_progress(EXPENSE_AMOUNTS, len(ops))
+        return len(ops), docs[-1]["_id"] if docs else None
+
+    async def run(self, batch_size: int = 1000, pause: float = 0.0) -> int:
+        """Run batches over every legacy amount once. Returns documents converted."""
+        converted, after = 0, None
+        while True:
+            n, after = await self.run_batch(batch_size, after)
+            converted += n
+            if after is None:
+                break
+            if pause:
+                await asyncio.sleep(pause)
+        if await self.check() == 0:
+            logger.info("Expense amount migration complete (%d converted)", converted)
+        return converted
@@ -0,0 +1,128 @@
+"""Balances and settle-up business logic."""
+
+import asyncio
+import heapq
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.fx import rate_table
+from app.core.money import from_minor, legacy_to_minor
+from app.models.group import GroupInDB
+from app.models.settlement import SettlementCreate, SettlementInDB
+from app.repositories.rollup_repository import ExpenseRollupRepository
+from app.repositories.settlement_repository import SettlementRepository
+from app.repositories.user_repository import UserRepository
+
+
+def simplify_debts(balances: dict[str, int]) -> list[tuple[str, str, int]]:
+    """Turn net balances (in cents, summing to zero) into (debtor, creditor, cents) transfers.
+
+    Greedy: repeatedly match the largest debtor with the largest creditor
+    using two max-heaps. O(n log n), and at most n - 1 transfers.
+    """
+    creditors = [(-amount, user) for user, amount in balances.items() if amount > 0]
+    debtors = [(amount, user) for user, amount in balances.items() if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = heapq.heappop(creditors)
+        debt, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debtor))
+    return transfers
+
+
+class SettlementService:
+    """Computes who owes whom and records settlements.
+
+    Every expense is treated as split equally among the group's current
+    members; recorded settlements offset the resulting balances. Everything
+    is reported in the group's base currency, which is also the currency
+    settlements are recorded in.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.repo = SettlementRepository(db)
+        self.rollups = ExpenseRollupRepository(db)
+        self.user_repo = UserRepository(db)
+
+    async def get_balances(self, group: GroupInDB) -> dict[str, int]:
+        """Net balance per user in minor units of the group's base currency:
+        positive is owed money, negative owes."""
+        group_id = str(group.id)
+        buckets, settled = await asyncio.gather(
+            self.rollups.totals_by_user(group_id),
+            self.repo.net_by_user(group_id),
+        )
+        currency = group.base_currency
+        converted = rate_table.convert_monthly(
+            [b["total"] for b in buckets],
+            [b["currency"] for b in buckets],
+            [(b["year"], b["month"]) for b in buckets],
+            currency,
+        )
+        paid: dict[str, int] = {}
+        for b, total in zip(buckets, converted):
+            paid[b["created_by"]] = paid.get(b["created_by"], 0) + total
+        members = sorted(m.get("user_id") for m in group.members)
+        balances = {user: 0 for user in members}
+        for user, minor in paid.items():
+            balances[user] = balances.get(user, 0) + minor
+        for user, amount in settled.items():
+            balances[user] = balances.get(user, 0) + legacy_to_minor(amount, currency)
+        if members:
+            # Spread leftover cents over the first members so balances sum to zero
+            share, remainder = divmod(sum(paid.values()), len(members))
+            for i, user in enumerate(members):
+                balances[user] -= share + (1 if i < remainder else 0)
+        return balances
+
+    async def get_settlements(self, group: GroupInDB) -> dict:
+        """Per-user balances plus the transfers that settle the group."""
+        balances = await self.get_balances(group)
+        transfers = simplify_debts(balances)
+        users = await self.user_repo.get_many(list(balances))
+        currency = group.base_currency
+
+        def name(user_id: str) -> str | None:
+            return users.get(user_id, {}).get("full_name")
+
+        return {
+            "currency": currency,
+            "balances": [
+                {"user_id": user, "full_name": name(user), "net": from_minor(cents, currency)}
+                for user, cents in sorted(balances.items(), key=lambda x: -x[1])
+            ],
+            "transfers": [
+                {
+                    "from_user": debtor,
+                    "from_name": name(debtor),
+                    "to_user": creditor,
+                    "to_name": name(creditor),
+                    "amount": from_minor(cents, currency),
+                }
+                for debtor, creditor, cents in transfers
+            ],
+        }
+
+    async def record_settlement(
+        self, group: GroupInDB, user_id: str, data: SettlementCreate
+    ) -> SettlementInDB:
+        """Record that user_id paid data.to_user. Both must be group members."""
+        if group.member_role(data.to_user) is None:
+            raise ValueError("Recipient is not a member of this group")
+        if data.to_user == user_id:
+            raise ValueError("Cannot settle with yourself")
+        settlement = SettlementInDB(
+            group_id=str(group.id),
+            from_user=user_id,
+            to_user=data.to_user,
+            amount=data.amount,
+            note=data.note,
+        )
+        return await self.repo.create(settlement)
@@ -0,0 +1,108 @@
+"""Expense statistics business logic."""
+
+from datetime import datetime
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core import metrics
+from app.core.fx import rate_table
+from app.core.money import default_currency, from_minor
+from app.core.response_cache import response_cache
+from app.core.singleflight import SingleFlight
+from app.repositories.rollup_repository import ExpenseRollupRepository
+from app.repositories.user_repository import UserRepository
+
+# Process-wide: identical concurrent stats queries share one aggregation
+stats_flight = SingleFlight()
+metrics.registry.callback_counter(
+    "stats_queries_coalesced_total", "Stats requests that joined an in-flight aggregation.",
+    lambda: stats_flight.coalesced,
+)
+
+
+class StatsService:
+    """Answers group stats queries from the pre-aggregated expense rollups."""
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self.rollups = ExpenseRollupRepository(db)
+        self.user_repo = UserRepository(db)
+
+    @staticmethod
+    def resolve_period(
+        period: str, year: int | None, month: int | None
+    ) -> tuple[int | None, int | None]:
+        """Return the (year, month) filter for a period, defaulting to the current one."""
+        now = datetime.utcnow()
+        if period == "month":
+            if year is None or month is None:
+                return now.year, now.month
+            return year, month
+        if period == "year":
+            return (year if year is not None else now.year), None
+        return None, None
+
+    async def get_group_stats(
+        self,
+        group_id: str,
+        period: str = "all",
+        year: int | None = None,
+        month: int | None = None,
+        currency: str | None = None,
+    ) -> dict:
+        """Total, per-category, per-user and monthly totals for a group and period,
+        in `currency` (the group's base currency; DEFAULT_CURRENCY if omitted).
+
+        Concurrent calls for the same (group, year, month, currency) are
+        coalesced, but only within one group version: a call made after a
+        write never joins an aggregation that started before it, whose result
+        would be cached under the new version.
+        """
+        year, month = self.resolve_period(period, year, month)
+        currency = currency or default_currency()
+        version = await response_cache.version(group_id)
+        return await stats_flight.do(
+            (group_id, version, year, month, currency),
+            lambda: self._compute_stats(group_id, year, month, currency),
+        )
+
+    async def _compute_stats(
+        self, group_id: str, year: int | None, month: int | None, currency: str
+    ) -> dict:
+        buckets = await self.rollups.get_buckets(group_id, year=year, month=month)
+        # One conversion over the bucket columns: a factor per (currency, month),
+        # and no conversion at all when every bucket is already in `currency`
+        totals = rate_table.convert_monthly(
+            [b["total"] for b in buckets],
+            [b["currency"] for b in buckets],
+            [(b["year"], b["month"]) for b in buckets],
+            currency,
+        )
+        by_category: dict[str, int] = {}
+        by_user: dict[str, int] = {}
+        monthly: dict[tuple[int, int], int] = {}
+        for b, total in zip(buckets, totals):
+            by_category[b["category"]] = by_category.get(b["category"], 0) + total
+            by_user[b["created_by"]] = by_user.get(b["created_by"], 0) + total
+            key = (b["year"], b["month"])
+            monthly[key] = monthly.get(key, 0) + total
+        users = await self.user_repo.get_many(list(by_user)) if by_user else {}
+        return {
+            "total": from_minor(sum(totals), currency),
+            "currency": currency,
+            "by_category": [
+                {"category": category, "total": from_minor(total, currency)}
+                for category, total in sorted(by_category.items(), key=lambda x: -x[1])
+            ],
+            "by_user": [
+                {
+                    "user_id": user_id,
+                    "total": from_minor(total, currency),
+                    "full_name": users.get(user_id, {}).get("full_name"),
+                }
+                for user_id, total in sorted(by_user.items(), key=lambda x: -x[1])
+            ],
+            "monthly": [
+                {"year": y, "month": m, "total": from_minor(total, currency)}
+                for (y, m), total in sorted(monthly.items())
+            ],
+        }
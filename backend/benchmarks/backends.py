@@ -0,0 +1,148 @@
+"""Database backends for the benchmark harness, with Mongo round-trip counting.
+
+- "mongod": a real local server (MONGODB_URL); round trips are counted with a
+  pymongo CommandListener.
+- "memory": an in-process mongomock-motor stand-in (no server, no network);
+  round trips are counted per collection operation. Aggregation stages it
+  does not implement (e.g. $merge) are unavailable. $add and $multiply are
+  patched to accept Decimal128 operands (see app.core.money.legacy_minor_expr).
+"""
+
+import decimal
+import functools
+import operator
+import uuid
+
+from bson.decimal128 import Decimal128, create_decimal128_context
+from pymongo import InsertOne, UpdateOne, monitoring
+
+from app.core.config import get_settings
+from app.core.database import database
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    """Counts database commands; read `count` before and after a request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self.count += 1
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+# Collection methods that cost one round trip against a real server
+_COUNTED_METHODS = [
+    "aggregate",
+    "bulk_write",
+    "count_documents",
+    "delete_many",
+    "delete_one",
+    "find",
+    "find_one",
+    "find_one_and_update",
+    "insert_many",
+    "insert_one",
+    "update_many",
+    "update_one",
+]
+
+
+def _patch_mongomock(counter: RoundTripCounter) -> None:
+    import mongomock.collection as mc
+
+    mc.Collection._bench_counter = counter
+    if getattr(mc.Collection, "_bench_patched", False):
+        return
+    originals = {name: getattr(mc.Collection, name) for name in _COUNTED_METHODS}
+
+    depth = 0
+
+    def counted(original):
+        def wrapper(self, *args, **kwargs):
+            # mongomock implements some methods on top of others (find_one -> find);
+            # only the outermost call is a round trip
+            nonlocal depth
+            if depth == 0:
+                mc.Collection._bench_counter.count += 1
+            depth += 1
+            try:
+                return original(self, *args, **kwargs)
+            finally:
+                depth -= 1
+
+        return wrapper
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        # mongomock cannot consume newer pymongo operation objects; replay them
+        mc.Collection._bench_counter.count += 1
+        for op in requests:
+            if isinstance(op, InsertOne):
+                originals["insert_one"](self, op._doc)
+            elif isinstance(op, UpdateOne):
+                originals["update_one"](self, op._filter, op._doc, upsert=bool(op._upsert))
+            else:
+                raise NotImplementedError(f"{type(op).__name__} is not supported by the stand-in")
+
+    for name, original in originals.items():
+        setattr(mc.Collection, name, counted(original))
+    mc.Collection.bulk_write = bulk_write
+    _patch_decimal_arithmetic()
+    mc.Collection._bench_patched = True
+
+
+def _patch_decimal_arithmetic() -> None:
+    """Let mongomock's $add and $multiply take Decimal128 operands, as a
+    server does: any decimal operand makes the result a decimal."""
+    import mongomock.aggregate as ma
+
+    original = ma._Parser._handle_arithmetic_operator
+    reducers = {"$add": operator.add, "$multiply": operator.mul}
+
+    def handle(self, op, values):
+        if op not in reducers or not isinstance(values, list):
+            return original(self, op, values)
+        parsed = list(self.parse_many(values))
+        if not any(isinstance(v, Decimal128) for v in parsed):
+            return original(self, op, values)
+        if any(v is None for v in parsed):
+            return None
+        ctx = create_decimal128_context()
+        operands = [
+            v.to_decimal() if isinstance(v, Decimal128) else ctx.create_decimal(v)
+            for v in parsed
+        ]
+        with decimal.localcontext(ctx):
+            return Decimal128(functools.reduce(reducers[op], operands))
+
+    ma._Parser._handle_arithmetic_operator = handle
+
+
+async def connect(backend: str, counter: RoundTripCounter, mongo_url: str | None = None) -> str:
+    """Connect the app's global DatabaseManager to a fresh benchmark database.
+
+    Returns the database name. For "mongod" the caller should run the app
+    lifespan afterwards so indexes exist.
+    """
+    settings = get_settings()
+    db_name = f"bench_{uuid.uuid4().hex[:8]}"
+    if backend == "mongod":
+        monitoring.register(counter)
+        if mongo_url:
+            settings.MONGODB_URL = mongo_url
+        settings.MONGODB_DB_NAME = db_name
+        return db_name
+    if backend == "memory":
+        from mongomock_motor import AsyncMongoMockClient
+
+        _patch_mongomock(counter)
+        database._client = AsyncMongoMockClient()
+        database._db = database._client[db_name]
+        database._analytics_db = database._db
+        return db_name
+    raise ValueError(f"Unknown backend: {backend}")
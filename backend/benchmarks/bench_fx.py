@@ -0,0 +1,105 @@
+"""Cost of converting expense amounts to a group's base currency.
+
+Usage:
+    python -m benchmarks.bench_fx [--rows 10000] [--currencies USD,EUR,GBP,JPY] [--years 3]
+
+Builds a synthetic daily rate table, then compares these paths:
+- per-row: look up both rates for every document and convert it
+- convert_many: the batched export path, one factor per (currency, date)
+- convert_monthly: the stats/balances path, over rollup-sized buckets
+
+It also times a single binary-search rate lookup.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from app.core.fx import RateTable
+
+
+def synthetic_rates(
+    currencies: list[str], pivot: str, start: date, days: int, rng_seed: int = 7
+) -> list[tuple[date, str, Decimal]]:
+    """Daily (day, currency, rate) rows following a random walk, skipping weekends like a real feed."""
+    rng = random.Random(rng_seed)
+    rows = []
+    for currency in currencies:
+        if currency == pivot:
+            continue
+        rate = rng.uniform(0.5, 150)
+        for i in range(days):
+            day = start + timedelta(days=i)
+            rate *= 1 + rng.gauss(0, 0.004)
+            if day.weekday() < 5:
+                rows.append((day, currency, Decimal(f"{rate:.6f}")))
+    return rows
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    fn()  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e3)
+    return round(statistics.median(samples), 3)
+
+
+def run(rows: int = 10000, currencies: list[str] | None = None, years: int = 3, repeat: int = 10) -> dict:
+    currencies = currencies or ["USD", "EUR", "GBP", "JPY"]
+    base = currencies[0]
+    start = date.today() - timedelta(days=365 * years)
+    table = RateTable(pivot="EUR")
+    table.load(synthetic_rates(currencies, table.pivot, start, 365 * years))
+
+    rng = random.Random(1)
+    amounts = [rng.randint(100, 50000) for _ in range(rows)]
+    row_currencies = [rng.choice(currencies) for _ in range(rows)]
+    days = [start + timedelta(days=rng.randrange(365 * years)) for _ in range(rows)]
+    # Rollup buckets: (month, currency) pairs, a few categories/payers each
+    months = [(d.year, d.month) for d in days[: rows // 10]]
+
+    def per_row() -> list[int]:
+        out = []
+        for amount, currency, day in zip(amounts, row_currencies, days):
+            num, den = table.factor(currency, base, lambda c: table.rate(c, day))
+            out.append(int((Decimal(amount * num) / den).to_integral_value(ROUND_HALF_UP)))
+        return out
+
+    batched = table.convert_many(amounts, row_currencies, days, base)
+    assert batched == per_row(), "batched conversion disagrees with per-row conversion"
+
+    lookup_day = start + timedelta(days=365)
+    return {
+        "rows": rows,
+        "currencies": currencies,
+        "rates": len(table),
+        "rate_lookup_us": round(timed(lambda: [table.rate("GBP", lookup_day) for _ in range(1000)], repeat), 3),
+        "per_row_ms": timed(per_row, repeat),
+        "convert_many_ms": timed(lambda: table.convert_many(amounts, row_currencies, days, base), repeat),
+        "convert_monthly_ms": timed(
+            lambda: table.convert_monthly(amounts[: len(months)], row_currencies[: len(months)], months, base),
+            repeat,
+        ),
+        "same_currency_ms": timed(lambda: table.convert_many(amounts, [base] * rows, days, base), repeat),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--currencies", default="USD,EUR,GBP,JPY", help="Comma-separated; the first is the base")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.currencies.split(","), args.years, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
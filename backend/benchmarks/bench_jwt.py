@@ -0,0 +1,78 @@
+"""Per-request cost of access token verification.
+
+Usage:
+    python -m benchmarks.bench_jwt [--repeat 20000]
+
+For each available JWT backend, measures full verification (signature, base64
+and JSON) and a cached verification through TokenVerifier (the per-request
+path in get_current_user_id once a token has been seen). Tokens issued by one
+backend are checked against the others to confirm they are interchangeable.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.core.config import get_settings
+from app.core.jwt_backends import JWT_BACKENDS, make_backend
+from app.core.security import TokenVerifier
+
+
+def measure(fn, token: str, repeat: int) -> float:
+    """Median wall time per call in microseconds (batches of 100 calls)."""
+    fn(token)  # warm up
+    samples = []
+    for _ in range(max(repeat // 100, 1)):
+        start = time.perf_counter()
+        for _ in range(100):
+            fn(token)
+        samples.append((time.perf_counter() - start) * 1e6 / 100)
+    return round(statistics.median(samples), 2)
+
+
+def available_backends(secret: str, algorithm: str) -> dict:
+    backends = {}
+    for name in JWT_BACKENDS:
+        try:
+            backends[name] = make_backend(name, secret, algorithm)
+        except RuntimeError as e:
+            print(f"skipping {name}: {e}")
+    return backends
+
+
+def run(repeat: int = 20000) -> dict:
+    settings = get_settings()
+    backends = available_backends(settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+    claims = {
+        "exp": datetime.utcnow() + timedelta(hours=1),
+        "sub": "65f0c0ffee0123456789abcd",
+        "type": "access",
+    }
+    results = {}
+    for name, backend in backends.items():
+        token = backend.encode(claims)
+        for other in backends.values():
+            assert other.decode(token)["sub"] == claims["sub"]
+        verifier = TokenVerifier(backend)
+        start = time.perf_counter()
+        for _ in range(1000):
+            backend.encode(claims)
+        results[name] = {
+            "encode_us": round((time.perf_counter() - start) * 1e3, 2),
+            "verify_us": measure(backend.decode, token, repeat),
+            "cached_verify_us": measure(verifier.decode, token, repeat),
+        }
+    return {"algorithm": settings.JWT_ALGORITHM, "backends": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Per-page serialization cost of list_expenses: model path vs lean path.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 100] [--repeat 200]
+
+"model" is the previous path: ExpenseInDB(**doc) per row, copied into an
+Expense, then jsonable_encoder + stdlib json (what FastAPI does for a dict
+return value). "lean" is the current path: projected raw documents shaped
+by expense_to_json and rendered by orjson.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import Int64, ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.routers.groups import _to_expense
+from app.core.responses import ORJSONResponse
+from app.models.expense import ExpenseInDB, expense_to_json
+
+
+def make_docs(rows: int) -> list[dict]:
+    """Raw documents shaped like Motor returns them."""
+    now = datetime.utcnow().replace(microsecond=0)
+    group_id, user_id = str(ObjectId()), str(ObjectId())
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Expense {i}",
+            "amount_minor": Int64(1000 + 100 * i),
+            "currency": "USD",
+            "category": "Food & Groceries",
+            "description": "Weekly shopping" if i % 2 else "",
+            "date": datetime(2025, 1, 1) + timedelta(days=i % 365),
+            "created_by": user_id,
+            "group_id": group_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+
+
+def model_path(docs: list[dict]) -> bytes:
+    items = [_to_expense(ExpenseInDB(**doc)) for doc in docs]
+    content = {"items": items, "limit": len(docs), "next_cursor": None}
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def lean_path(docs: list[dict]) -> bytes:
+    content = {"items": [expense_to_json(doc) for doc in docs], "limit": len(docs), "next_cursor": None}
+    return ORJSONResponse(content).body
+
+
+def measure(fn, docs: list[dict], repeat: int) -> list[float]:
+    """Wall time per call in microseconds."""
+    fn(docs)  # warm up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(docs)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def run(rows: int = 100, repeat: int = 200) -> dict:
+    docs = make_docs(rows)
+    before = measure(model_path, docs, repeat)
+    after = measure(lean_path, docs, repeat)
+    assert json.loads(model_path(docs))["items"][0]["id"] == json.loads(lean_path(docs))["items"][0]["id"]
+    return {
+        "rows": rows,
+        "model_us_median": round(statistics.median(before), 1),
+        "lean_us_median": round(statistics.median(after), 1),
+        "speedup": round(statistics.median(before) / statistics.median(after), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
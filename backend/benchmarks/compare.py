@@ -0,0 +1,64 @@
+"""Compare two benchmark result files produced by benchmarks.run.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 10]
+
+Exits with status 1 if any scenario's p50 or p95 regressed by more than
+--threshold percent, or needs more Mongo round trips per request.
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "throughput_rps", "round_trips_per_request"]
+
+
+def _change(old: float, new: float) -> float | None:
+    if not old:
+        return None
+    return (new - old) / old * 100
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[list[str], bool]:
+    """Return (report lines, regressed)."""
+    lines = [f"{'scenario':28s} " + " ".join(f"{m:>24s}" for m in METRICS)]
+    regressed = False
+    for name, new in candidate["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            lines.append(f"{name:28s} (new scenario)")
+            continue
+        cells = []
+        for metric in METRICS:
+            change = _change(old[metric], new[metric])
+            cell = f"{old[metric]:.2f}->{new[metric]:.2f}"
+            if change is not None:
+                cell += f" ({change:+.0f}%)"
+            cells.append(f"{cell:>24s}")
+        if any(
+            (_change(old[m], new[m]) or 0) > threshold for m in ("p50_ms", "p95_ms")
+        ) or new["round_trips_per_request"] > old["round_trips_per_request"]:
+            regressed = True
+            cells.append("  REGRESSION")
+        lines.append(f"{name:28s} " + " ".join(cells))
+    return lines, regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed latency increase in percent")
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    lines, regressed = compare(baseline, candidate, args.threshold)
+    print("\n".join(lines))
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
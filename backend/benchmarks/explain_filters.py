@@ -0,0 +1,115 @@
+"""Check that every list_expenses filter combination is served by an index.
+
+Usage:
+    python -m benchmarks.explain_filters [--mongo-url mongodb://localhost:27017]
+
+Needs a real mongod, because the in-memory backend has no explain. Seeds a
+throwaway database and creates the production indexes. Then, for every
+combination of filters, explains the first page and a keyset page exactly as
+list_expenses builds them. Exits with status 1 if any winning plan contains a
+COLLSCAN.
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+import uuid
+from datetime import date, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import get_settings
+from app.repositories.expense_repository import EXPENSE_PROJECTION, ExpenseRepository
+from benchmarks.seed import SCALES, seed
+
+
+def plan_summary(explain: dict) -> tuple[list[str], list[str]]:
+    """Stage names and index names anywhere in the winning plan."""
+    stages, indexes = [], []
+
+    def walk(node) -> None:
+        if isinstance(node, dict):
+            if "stage" in node:
+                stages.append(node["stage"])
+            if "indexName" in node:
+                indexes.append(node["indexName"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(explain["queryPlanner"]["winningPlan"])
+    return stages, indexes
+
+
+def filter_options(user_id: str) -> dict[str, dict]:
+    """One example value per list_expenses filter, as build_filter kwargs."""
+    today = date.today()
+    return {
+        "date": {"start": today - timedelta(days=90), "end": today},
+        "category": {"categories": ["Transport", "Rent"]},
+        "created_by": {"created_by": user_id},
+        "amount": {"min_amount": 1000, "max_amount": 5000},  # minor units
+        "search": {"search": "expense"},
+    }
+
+
+async def check(db, group_id: str, user_id: str) -> list[dict]:
+    repo = ExpenseRepository(db)
+    options = filter_options(user_id)
+    sample = await repo.get_by_group_raw(group_id, limit=1)
+    position = (sample[0]["date"], sample[0]["_id"])
+    results = []
+    for size in range(len(options) + 1):
+        for names in itertools.combinations(options, size):
+            kwargs = {k: v for name in names for k, v in options[name].items()}
+            query = repo.build_filter(group_id, **kwargs)
+            for after in (None, position):
+                cursor = repo.page_cursor(query, 0, 21, -1, after, projection=EXPENSE_PROJECTION)
+                stages, indexes = plan_summary(await cursor.explain())
+                results.append(
+                    {
+                        "filters": "+".join(names) or "(none)",
+                        "keyset": after is not None,
+                        "stages": stages,
+                        "indexes": sorted(set(indexes)),
+                        "collscan": "COLLSCAN" in stages,
+                    }
+                )
+    return results
+
+
+async def run(mongo_url: str, scale: str) -> int:
+    client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=5000)
+    db_name = f"explain_{uuid.uuid4().hex[:8]}"
+    db = client[db_name]
+    try:
+        await ExpenseRepository(db).ensure_indexes()
+        data = await seed(db, **SCALES[scale])
+        results = await check(db, data.group_ids[0], data.user_ids[0])
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+    failures = 0
+    for r in results:
+        status = "COLLSCAN" if r["collscan"] else "ok"
+        failures += r["collscan"]
+        keyset = " (keyset)" if r["keyset"] else ""
+        print(f"{status:8} {r['filters'] + keyset:55} {', '.join(r['indexes']) or '-'}")
+    print(f"\n{len(results)} plans, {failures} collection scans")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", default=None, help="mongod URL (default: settings MONGODB_URL)")
+    parser.add_argument("--scale", choices=SCALES, default="tiny")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.mongo_url or get_settings().MONGODB_URL, args.scale)))
+
+
+if __name__ == "__main__":
+    main()
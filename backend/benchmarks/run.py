@@ -0,0 +1,283 @@
+"""In-process benchmark and load test for the API hot paths.
+
+Seeds users, groups and expenses at a configurable scale, then drives the
+ASGI app in-process (no network) and reports p50/p95/p99 latency, throughput
+and Mongo round trips per request for each scenario.
+
+Usage:
+    python -m benchmarks.run [--backend memory|mongod] [--scale small]
+                             [--requests 200] [--concurrency 1] [--out results.json]
+
+Compare two result files with `python -m benchmarks.compare old.json new.json`.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+
+import httpx
+
+from app.core.database import database
+from app.core.fx import rate_table
+from app.core.response_cache import response_cache
+from app.core.security import create_access_token
+from app.repositories.group_repository import group_cache
+from benchmarks import backends
+from benchmarks.bench_fx import synthetic_rates
+from benchmarks.seed import PASSWORD, SCALES, SeedResult, seed
+from main import app
+
+API = "/api/v1"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+Scenario = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+def build_scenarios(data: SeedResult, rng: random.Random) -> tuple[dict[str, Scenario], dict, dict, dict]:
+    """Return (scenario name -> request function, auth headers, deep pages, deep cursors).
+
+    The deep page/cursor maps are filled in by prepare_deep_positions.
+    """
+    token = create_access_token(data.user_ids[0])
+    auth = {"Authorization": f"Bearer {token}"}
+    today = date.today()
+
+    def group() -> str:
+        return rng.choice(data.group_ids)
+
+    async def list_groups(c):
+        return await c.get(f"{API}/groups", headers=auth)
+
+    async def list_expenses_shallow(c):
+        return await c.get(f"{API}/groups/{group()}/expenses", params={"limit": 20}, headers=auth)
+
+    async def list_expenses_deep_page(c):
+        gid = group()
+        # Pages near the end of the group's history; totals come from the cached counter
+        return await c.get(f"{API}/groups/{gid}/expenses", params={"limit": 20, "page": deep_pages[gid]}, headers=auth)
+
+    async def list_expenses_deep_cursor(c):
+        gid = group()
+        return await c.get(
+            f"{API}/groups/{gid}/expenses",
+            params={"limit": 20, "after": deep_cursors[gid], "include_total": "false"},
+            headers=auth,
+        )
+
+    async def stats_all(c):
+        return await c.get(f"{API}/groups/{group()}/stats", params={"period": "all"}, headers=auth)
+
+    async def stats_year(c):
+        return await c.get(f"{API}/groups/{group()}/stats", params={"period": "year", "year": today.year}, headers=auth)
+
+    async def stats_month(c):
+        return await c.get(
+            f"{API}/groups/{group()}/stats",
+            params={"period": "month", "year": today.year, "month": today.month},
+            headers=auth,
+        )
+
+    async def login(c):
+        i = rng.randrange(len(data.emails))
+        return await c.post(f"{API}/auth/login", json={"email": data.emails[i], "password": PASSWORD})
+
+    async def create_expense(c):
+        return await c.post(
+            f"{API}/groups/{group()}/expenses",
+            json={
+                "title": "Benchmark expense",
+                "amount": round(rng.uniform(1, 100), 2),
+                "category": "Other",
+                "date": today.isoformat(),
+            },
+            headers=auth,
+        )
+
+    deep_pages: dict[str, int] = {}
+    deep_cursors: dict[str, str] = {}
+    scenarios = {
+        "list_groups": list_groups,
+        "list_expenses_shallow": list_expenses_shallow,
+        "list_expenses_deep_page": list_expenses_deep_page,
+        "list_expenses_deep_cursor": list_expenses_deep_cursor,
+        "stats_all": stats_all,
+        "stats_year": stats_year,
+        "stats_month": stats_month,
+        "login": login,
+        "create_expense": create_expense,
+    }
+    return scenarios, auth, deep_pages, deep_cursors
+
+
+async def prepare_deep_positions(
+    client: httpx.AsyncClient, data: SeedResult, auth: dict, deep_pages: dict, deep_cursors: dict
+) -> None:
+    """Find a page ~90% deep per group, and the cursor that starts at the same place."""
+    from app.api.routers.groups import _expense_cursor
+
+    for gid in data.group_ids:
+        r = await client.get(f"{API}/groups/{gid}/expenses", params={"limit": 20}, headers=auth)
+        pages = max(1, r.json()["pages"])
+        deep_pages[gid] = max(1, int(pages * 0.9))
+        skip = (deep_pages[gid] - 1) * 20
+        docs = await (
+            database.db.expenses.find({"group_id": gid})
+            .sort([("date", -1), ("_id", -1)])
+            .skip(max(0, skip - 1))
+            .limit(1)
+            .to_list(length=1)
+        )
+        deep_cursors[gid] = _expense_cursor(docs[0]) if docs else ""
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    fn: Scenario,
+    requests: int,
+    concurrency: int,
+    counter: backends.RoundTripCounter,
+    cold: bool,
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            if cold:
+                group_cache.clear()
+                await response_cache.backend.clear()
+            start = time.perf_counter()
+            response = await fn(client)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    round_trips_before = counter.count
+    wall_start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    wall = time.perf_counter() - wall_start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "round_trips_per_request": round((counter.count - round_trips_before) / max(1, len(latencies)), 2),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    counter = backends.RoundTripCounter()
+    db_name = await backends.connect(args.backend, counter, args.mongo_url)
+    lifespan = app.router.lifespan_context(app) if args.backend == "mongod" else None
+    if lifespan is not None:
+        await lifespan.__aenter__()
+    try:
+        scale = dict(SCALES[args.scale])
+        for key in scale:
+            override = getattr(args, key)
+            if override is not None:
+                scale[key] = override
+        currencies = args.currencies.split(",") if args.currencies else None
+        if currencies:
+            days = 3 * 365 + 30
+            rate_table.load(synthetic_rates(currencies, rate_table.pivot, date.today() - timedelta(days=days), days))
+        seed_start = time.perf_counter()
+        data = await seed(database.db, **scale, currencies=currencies)
+        seed_seconds = time.perf_counter() - seed_start
+
+        rng = random.Random(args.seed)
+        scenarios, auth, deep_pages, deep_cursors = build_scenarios(data, rng)
+        selected = args.scenario or list(scenarios)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await prepare_deep_positions(client, data, auth, deep_pages, deep_cursors)
+            results = {}
+            for name in selected:
+                n = args.login_requests if name == "login" else args.requests
+                results[name] = await run_scenario(
+                    client, scenarios[name], n, args.concurrency, counter, args.cold
+                )
+                print(f"{name:28s} p50={results[name]['p50_ms']:8.2f}ms "
+                      f"p95={results[name]['p95_ms']:8.2f}ms "
+                      f"rps={results[name]['throughput_rps']:8.1f} "
+                      f"rt/req={results[name]['round_trips_per_request']}")
+    finally:
+        if args.backend == "mongod" and not args.keep:
+            await database.db.client.drop_database(db_name)
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "scale": args.scale,
+            "seed": {**scale, "currencies": currencies, "seconds": round(seed_seconds, 2)},
+            "concurrency": args.concurrency,
+            "cold": args.cold,
+        },
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["memory", "mongod"], default="memory")
+    parser.add_argument("--mongo-url", help="mongod URL (default: settings MONGODB_URL)")
+    parser.add_argument("--scale", choices=list(SCALES), default="small")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--groups", type=int)
+    parser.add_argument("--members", type=int)
+    parser.add_argument("--expenses-per-group", type=int)
+    parser.add_argument(
+        "--currencies", help="Seed expenses in these currencies (comma-separated, first is the group base) "
+        "with synthetic exchange rates"
+    )
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=20, help="Requests for the (bcrypt-bound) login scenario")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--cold", action="store_true", help="Clear in-process caches before every request")
+    parser.add_argument("--scenario", action="append", help="Run only this scenario (repeatable)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep", action="store_true", help="Keep the mongod benchmark database")
+    parser.add_argument("--out", help="Write JSON results to this file")
+    args = parser.parse_args()
+    results = asyncio.run(run(args))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Deterministic data seeding for the benchmark harness."""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.security import password_hasher
+from app.models.expense import PREDEFINED_CATEGORIES, ExpenseInDB
+from app.models.group import GroupInDB, MemberRole
+from app.models.user import UserInDB
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.group_repository import GroupRepository
+
+PASSWORD = "benchmark-password"
+
+SCALES = {
+    "tiny": {"users": 20, "groups": 5, "members": 5, "expenses_per_group": 200},
+    "small": {"users": 200, "groups": 30, "members": 20, "expenses_per_group": 2000},
+    "medium": {"users": 1000, "groups": 100, "members": 50, "expenses_per_group": 20000},
+    "large": {"users": 5000, "groups": 300, "members": 200, "expenses_per_group": 100000},
+}
+
+
+@dataclass
+class SeedResult:
+    """IDs the scenarios need; user_ids[0] belongs to every group."""
+
+    user_ids: list[str] = field(default_factory=list)
+    emails: list[str] = field(default_factory=list)
+    group_ids: list[str] = field(default_factory=list)
+    expenses: int = 0
+
+
+async def seed(
+    db: AsyncIOMotorDatabase,
+    users: int,
+    groups: int,
+    members: int,
+    expenses_per_group: int,
+    rng_seed: int = 42,
+    currencies: list[str] | None = None,
+) -> SeedResult:
+    """Insert users, groups and expenses. Expenses go through ExpenseRepository
+    so rollups and counters are maintained exactly as in production.
+
+    With `currencies`, groups use the first as their base currency and each
+    expense picks one at random (rates must be loaded for all of them).
+    """
+    currencies = currencies or ["USD"]
+    rng = random.Random(rng_seed)
+    result = SeedResult()
+    hashed = await password_hasher.hash(PASSWORD)
+
+    user_docs = [
+        UserInDB(
+            email=f"bench{i}@example.com",
+            full_name=f"Bench User {i}",
+            hashed_password=hashed,
+        ).model_dump(by_alias=True, exclude={"id", "_id"})
+        for i in range(users)
+    ]
+    inserted = await db.users.insert_many(user_docs)
+    result.user_ids = [str(oid) for oid in inserted.inserted_ids]
+    result.emails = [doc["email"] for doc in user_docs]
+
+    group_repo = GroupRepository(db)
+    expense_repo = ExpenseRepository(db)
+    start = date.today() - timedelta(days=3 * 365)
+    for g in range(groups):
+        member_ids = [result.user_ids[0]] + rng.sample(result.user_ids[1:], min(members, users) - 1)
+        group = await group_repo.create(
+            GroupInDB(
+                name=f"Bench Group {g}",
+                created_by=member_ids[0],
+                members=[
+                    {"user_id": uid, "role": MemberRole.ADMIN.value if i == 0 else MemberRole.MEMBER.value}
+                    for i, uid in enumerate(member_ids)
+                ],
+                base_currency=currencies[0],
+                expense_count=0,
+            )
+        )
+        group_id = str(group.id)
+        result.group_ids.append(group_id)
+        batch = [
+            ExpenseInDB(
+                title=f"Expense {i}",
+                amount_minor=rng.randint(100, 50000),
+                currency=rng.choice(currencies),
+                category=rng.choice(PREDEFINED_CATEGORIES),
+                description="",
+                date=start + timedelta(days=rng.randrange(3 * 365)),
+                created_by=rng.choice(member_ids),
+                group_id=group_id,
+            )
+            for i in range(expenses_per_group)
+        ]
+        await expense_repo.create_many(group_id, batch, ordered=False)
+        result.expenses += len(batch)
+    return result
@@ -1,13 +1,29 @@
 """FastAPI application entry point."""
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1 import api_router
 from app.core.config import get_settings
+from app.core.context import RequestContextMiddleware
 from app.core.database import database
+from app.core.events import ChangeStreamRelay, event_broker
+from app.core.fx import rate_table
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from app.core.revocation import revocation_list
+from app.core.responses import ORJSONResponse
+from app.core.security import password_hasher
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.group_repository import GroupRepository
+from app.repositories.rollup_repository import ExpenseRollupRepository
+from app.repositories.token_repository import RefreshTokenRepository, RevokedSessionRepository
+from app.services.migration_service import ExpenseAmountMigration, ExpenseDateMigration
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
@@ -17,8 +33,66 @@ async def lifespan(app: FastAPI):
     # Create indexes for performance
     await database.db.users.create_index("email", unique=True)
     await database.db.groups.create_index("members.user_id")
-    await database.db.expenses.create_index([("group_id", 1), ("date", -1)])
+    await ExpenseRepository(database.db).ensure_indexes()
+    await ExpenseRollupRepository(database.db).ensure_indexes()
+    await database.db.settlements.create_index([("group_id", 1), ("created_at", -1)])
+    await RefreshTokenRepository(database.db).ensure_indexes()
+    revoked_sessions = RevokedSessionRepository(database.db)
+    await revoked_sessions.ensure_indexes()
+
+    settings = get_settings()
+    if settings.FX_RATES_PATH:
+        rate_table.load_file(settings.FX_RATES_PATH)
+    currencies = await ExpenseRollupRepository(database.db).currencies()
+    currencies |= await GroupRepository(database.db).base_currencies()
+    missing_rates = rate_table.missing(currencies)
+    if missing_rates:
+        logger.error(
+            "No exchange rates for %s, which stored expenses or groups use; "
+            "stats and settlements that need them return 503 until FX_RATES_PATH covers them",
+            ", ".join(missing_rates),
+        )
+    # Load revoked sessions, then keep pulling ones revoked by other workers
+    await revocation_list.sync(revoked_sessions)
+    revocation_task = asyncio.create_task(
+        revocation_list.run(revoked_sessions, settings.REVOCATION_SYNC_SECONDS)
+    )
+
+    # Keep idle event streams alive; optionally relay events between workers
+    event_tasks = [asyncio.create_task(event_broker.heartbeat(settings.EVENTS_KEEPALIVE_SECONDS))]
+    if settings.EVENTS_CHANGE_STREAMS:
+        relay = ChangeStreamRelay(database.db, event_broker)
+        if await relay.available():
+            event_tasks.append(asyncio.create_task(relay.run()))
+        else:
+            logger.warning("EVENTS_CHANGE_STREAMS needs a replica set; events stay local to each worker")
+
+    # Report (and optionally convert in the background) legacy string dates and float amounts
+    migration_tasks = []
+    migration = ExpenseDateMigration(database.db)
+    legacy_dates = await migration.check()
+    if legacy_dates:
+        logger.warning("%d expenses still have legacy string dates", legacy_dates)
+        if settings.EXPENSE_DATE_MIGRATION_ON_STARTUP:
+            migration_tasks.append(asyncio.create_task(
+                migration.run(batch_size=settings.EXPENSE_DATE_MIGRATION_BATCH_SIZE, pause=0.1)
+            ))
+    amount_migration = ExpenseAmountMigration(database.db)
+    legacy_amounts = await amount_migration.check()
+    if legacy_amounts:
+        logger.warning("%d expenses still have legacy float amounts", legacy_amounts)
+        if settings.EXPENSE_AMOUNT_MIGRATION_ON_STARTUP:
+            migration_tasks.append(asyncio.create_task(
+                amount_migration.run(batch_size=settings.EXPENSE_AMOUNT_MIGRATION_BATCH_SIZE, pause=0.1)
+            ))
     yield
+    revocation_task.cancel()
+    for task in event_tasks:
+        task.cancel()
+    event_broker.close_all()
+    for task in migration_tasks:
+        task.cancel()
+    password_hasher.shutdown()
     await database.disconnect()
 
 
@@ -30,6 +104,7 @@ def create_application() -> FastAPI:
         version=settings.APP_VERSION,
         description="Group expense tracking API for families, roommates, and friends.",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
     )
@@ -41,8 +116,14 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Let the frontend read database timings (see RequestContextMiddleware)
+        expose_headers=["Server-Timing"],
     )
 
+    app.add_middleware(RequestContextMiddleware, timing_allow_origin=", ".join(settings.cors_origins_list))
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
     # API routes
     app.include_router(api_router)
 
@@ -51,6 +132,13 @@ def create_application() -> FastAPI:
         """Health check endpoint for Docker/K8s."""
         return {"status": "ok"}
 
+    if settings.METRICS_ENABLED:
+
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            """Prometheus scrape endpoint."""
+            return Response(registry.render(), media_type=CONTENT_TYPE)
+
     return app
 
 
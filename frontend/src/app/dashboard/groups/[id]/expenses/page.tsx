@@ -1,15 +1,32 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import Link from "next/link";
 import { api } from "@/lib/api";
+import { followGroupEvents } from "@/lib/events";
+import { formatMoney } from "@/lib/format";
 import { useAuth } from "@/contexts/AuthContext";
-import type { Expense, Group } from "@/lib/types";
+import type { ChangesPage, Expense, ExpensePage, Group, GroupOverview } from "@/lib/types";
 import { format } from "date-fns";
 import { EmptyState } from "@/components/ui/EmptyState";
 import { ErrorState } from "@/components/ui/ErrorState";
 import { PageLoader } from "@/components/ui/PageLoader";
 
+const SYNC_INTERVAL_MS = 30_000;
+
+/** Upsert by id, keeping newest-first order. Unless `all` is set, new items
+ * older than the loaded range are left for paging to bring in. */
+function mergeExpenses(current: Expense[], incoming: Expense[], all: boolean): Expense[] {
+  const byId = new Map(current.map((e) => [e.id, e]));
+  const oldest = current[current.length - 1];
+  for (const e of incoming) {
+    if (all || byId.has(e.id) || !oldest || e.date >= oldest.date) byId.set(e.id, e);
+  }
+  return Array.from(byId.values()).sort(
+    (a, b) => b.date.localeCompare(a.date) || b.id.localeCompare(a.id)
+  );
+}
+
 export default function ExpensesPage({ params }: { params: { id: string } }) {
   const { id } = params;
   const { user } = useAuth();
@@ -17,27 +34,108 @@ export default function ExpensesPage({ params }: { params: { id: string } }) {
   const [expenses, setExpenses] = useState<Expense[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
-  const [page, setPage] = useState(1);
-  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const sentinelRef = useRef<HTMLDivElement | null>(null);
+  const syncToken = useRef<string | null>(null);
+  const fullyLoaded = useRef(false);
+  fullyLoaded.current = !loading && nextCursor === null;
   const limit = 20;
 
-  useEffect(() => {
-    api.get<Group>(`/groups/${id}`).then((r) => setGroup(r.data)).catch(() => {});
-  }, [id]);
-
   useEffect(() => {
     setLoading(true);
+    // Group and first page in one request; later pages use /expenses with the cursor
     api
-      .get<{ items: Expense[]; total: number }>(`/groups/${id}/expenses`, {
-        params: { page, limit, sort_order: -1 },
+      .get<GroupOverview>(`/groups/${id}/overview`, {
+        params: { fields: "group,expenses", limit },
       })
       .then((res) => {
-        setExpenses(res.data.items);
-        setTotal(res.data.total);
+        setGroup(res.data.group ?? null);
+        setExpenses(res.data.expenses?.items ?? []);
+        setNextCursor(res.data.expenses?.next_cursor ?? null);
+        syncToken.current = res.data.expenses?.sync_token ?? null;
       })
       .catch(() => setError("Failed to load expenses"))
       .finally(() => setLoading(false));
-  }, [id, page]);
+  }, [id]);
+
+  const loadMore = useCallback(() => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    api
+      .get<ExpensePage>(`/groups/${id}/expenses`, {
+        params: { after: nextCursor, limit, sort_order: -1, include_total: false },
+      })
+      .then((res) => {
+        setExpenses((prev) => mergeExpenses(prev, res.data.items, true));
+        setNextCursor(res.data.next_cursor);
+      })
+      .catch(() => setError("Failed to load expenses"))
+      .finally(() => setLoadingMore(false));
+  }, [id, nextCursor, loadingMore]);
+
+  // Delta sync: fetch everything changed since the last token
+  const syncing = useRef(false);
+  const syncChanges = useCallback(async () => {
+    if (syncing.current || !syncToken.current) return;
+    syncing.current = true;
+    try {
+      let more = true;
+      while (more) {
+        const res = await api.get<ChangesPage>(`/groups/${id}/changes`, {
+          params: { since: syncToken.current },
+        });
+        syncToken.current = res.data.next;
+        more = res.data.has_more;
+        if (res.data.items.length > 0) {
+          setExpenses((prev) => mergeExpenses(prev, res.data.items, fullyLoaded.current));
+        }
+      }
+    } catch {
+      // Keep the token; the next sync retries
+    } finally {
+      syncing.current = false;
+    }
+  }, [id]);
+
+  // Live events; each (re)connect and resync catches up through /changes
+  const live = useRef(false);
+  useEffect(() => {
+    const controller = new AbortController();
+    followGroupEvents(
+      id,
+      ({ event, data }) => {
+        if (event === "expense_created") {
+          setExpenses((prev) => mergeExpenses(prev, [data as unknown as Expense], fullyLoaded.current));
+        } else if (event === "ready" || event === "resync" || event === "expenses_imported") {
+          syncChanges();
+        }
+      },
+      controller.signal,
+      () => (live.current = true),
+      () => (live.current = false)
+    );
+    return () => controller.abort();
+  }, [id, syncChanges]);
+
+  // Poll /changes while the tab is visible and the event stream is down
+  useEffect(() => {
+    const timer = setInterval(() => {
+      if (!document.hidden && !live.current) syncChanges();
+    }, SYNC_INTERVAL_MS);
+    return () => clearInterval(timer);
+  }, [syncChanges]);
+
+  // Infinite scroll: fetch the next cursor page when the sentinel becomes visible
+  useEffect(() => {
+    const el = sentinelRef.current;
+    if (!el || !nextCursor) return;
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0]?.isIntersecting) loadMore();
+    });
+    observer.observe(el);
+    return () => observer.disconnect();
+  }, [nextCursor, loadMore]);
 
   if (loading && expenses.length === 0) return <PageLoader />;
   if (error)
@@ -116,7 +214,7 @@ export default function ExpensesPage({ params }: { params: { id: string } }) {
                                 )}
                               </div>
                               <span className="text-lg font-semibold text-gray-900 dark:text-gray-100">
-                                ${e.amount.toFixed(2)}
+                                {formatMoney(e.amount, e.currency)}
                               </span>
                             </div>
                             {e.created_by === user?.id && (
@@ -132,24 +230,14 @@ export default function ExpensesPage({ params }: { params: { id: string } }) {
             );
           })()}
 
-          {total > limit && (
-            <div className="mt-6 flex justify-center gap-2">
-              <button
-                onClick={() => setPage((p) => Math.max(1, p - 1))}
-                disabled={page <= 1}
-                className="rounded-lg border px-4 py-2 text-sm disabled:opacity-50"
-              >
-                Previous
-              </button>
-              <span className="py-2 text-sm text-gray-500">
-                Page {page} of {Math.ceil(total / limit)}
-              </span>
+          {nextCursor && (
+            <div ref={sentinelRef} className="mt-6 flex justify-center">
               <button
-                onClick={() => setPage((p) => p + 1)}
-                disabled={page >= Math.ceil(total / limit)}
+                onClick={loadMore}
+                disabled={loadingMore}
                 className="rounded-lg border px-4 py-2 text-sm disabled:opacity-50"
               >
-                Next
+                {loadingMore ? "Loading…" : "Load more"}
               </button>
             </div>
           )}
@@ -3,6 +3,7 @@
 import { useEffect, useState } from "react";
 import Link from "next/link";
 import { api } from "@/lib/api";
+import { formatMoney } from "@/lib/format";
 import type { Group, Stats } from "@/lib/types";
 import {
   PieChart,
@@ -67,6 +68,8 @@ export default function StatsPage({ params }: { params: { id: string } }) {
     return <ErrorState message={error} onRetry={() => window.location.reload()} />;
 
   const topSpender = stats?.by_user?.[0];
+  const money = (v: number, compact = false) =>
+    formatMoney(v, stats?.currency ?? group?.base_currency ?? "USD", compact);
   const pieData = stats?.by_category?.map((c, i) => ({
     name: c.category,
     value: c.total,
@@ -113,13 +116,13 @@ export default function StatsPage({ params }: { params: { id: string } }) {
         <div className="rounded-xl border border-gray-200 bg-white p-4 shadow-sm dark:border-gray-800 dark:bg-gray-900">
           <p className="text-xs text-gray-500 dark:text-gray-400">Total spent</p>
           <p className="mt-1 text-2xl font-bold text-gray-900 dark:text-gray-100">
-            ${(stats?.total ?? 0).toFixed(2)}
+            {money(stats?.total ?? 0)}
           </p>
         </div>
         <div className="rounded-xl border border-gray-200 bg-white p-4 shadow-sm dark:border-gray-800 dark:bg-gray-900">
           <p className="text-xs text-gray-500 dark:text-gray-400">Top spender</p>
           <p className="mt-1 text-lg font-semibold text-gray-900 dark:text-gray-100">
-            {topSpender ? `$${topSpender.total.toFixed(2)}` : "—"}
+            {topSpender ? money(topSpender.total) : "—"}
           </p>
           {topSpender && (
             <p className="text-xs text-gray-500 dark:text-gray-400">
@@ -149,7 +152,7 @@ export default function StatsPage({ params }: { params: { id: string } }) {
                     <Cell key={i} fill={entry.color} />
                   ))}
                 </Pie>
-                <Tooltip formatter={(v: number) => `$${v.toFixed(2)}`} />
+                <Tooltip formatter={(v: number) => money(v)} />
               </PieChart>
             </ResponsiveContainer>
           </div>
@@ -163,8 +166,8 @@ export default function StatsPage({ params }: { params: { id: string } }) {
             <ResponsiveContainer width="100%" height="100%">
               <BarChart data={barData} margin={{ top: 5, right: 5, left: -10, bottom: 5 }}>
                 <XAxis dataKey="name" tick={{ fontSize: 11 }} />
-                <YAxis tick={{ fontSize: 11 }} tickFormatter={(v) => `$${v}`} />
-                <Tooltip formatter={(v: number) => [`$${v.toFixed(2)}`, "Total"]} />
+                <YAxis tick={{ fontSize: 11 }} tickFormatter={(v: number) => money(v, true)} />
+                <Tooltip formatter={(v: number) => [money(v), "Total"]} />
                 <Bar dataKey="total" fill="#22c55e" radius={[4, 4, 0, 0]} />
               </BarChart>
             </ResponsiveContainer>
@@ -1,7 +1,7 @@
 "use client";
 
 import { createContext, useCallback, useContext, useEffect, useState } from "react";
-import { api, clearTokens, hasToken, setTokens } from "@/lib/api";
+import { api, clearTokens, hasToken, revokeSession, setTokens } from "@/lib/api";
 import type { User } from "@/lib/types";
 
 interface AuthContextType {
@@ -69,6 +69,7 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
   );
 
   const logout = useCallback(() => {
+    void revokeSession();
     clearTokens();
     setUser(null);
   }, []);
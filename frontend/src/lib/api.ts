@@ -1,6 +1,6 @@
 import axios, { type AxiosError } from "axios";
 
-const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000/api/v1";
+export const API_BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000/api/v1";
 
 export const api = axios.create({
   baseURL: API_BASE,
@@ -15,6 +15,27 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+// Refresh tokens are single-use (reusing one ends the session), so concurrent
+// 401s share one in-flight refresh.
+let refreshing: Promise<string> | null = null;
+
+function refreshAccessToken(refresh: string): Promise<string> {
+  if (!refreshing) {
+    refreshing = axios
+      .post<{ access_token: string; refresh_token: string }>(`${API_BASE}/auth/refresh`, {
+        refresh_token: refresh,
+      })
+      .then(({ data }) => {
+        setTokens(data.access_token, data.refresh_token);
+        return data.access_token;
+      })
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+}
+
 api.interceptors.response.use(
   (res) => res,
   async (err: AxiosError<{ detail?: string }>) => {
@@ -24,12 +45,8 @@ api.interceptors.response.use(
       const refresh = localStorage.getItem("refresh_token");
       if (refresh) {
         try {
-          const { data } = await axios.post<{ access_token: string }>(
-            `${API_BASE}/auth/refresh`,
-            { refresh_token: refresh }
-          );
-          localStorage.setItem("access_token", data.access_token);
-          original!.headers.Authorization = `Bearer ${data.access_token}`;
+          const accessToken = await refreshAccessToken(refresh);
+          original!.headers.Authorization = `Bearer ${accessToken}`;
           return api(original!);
         } catch {
           localStorage.removeItem("access_token");
@@ -51,6 +68,13 @@ export function setTokens(access: string, refresh: string) {
   }
 }
 
+export async function revokeSession() {
+  const refresh = typeof window !== "undefined" ? localStorage.getItem("refresh_token") : null;
+  if (refresh) {
+    await axios.post(`${API_BASE}/auth/logout`, { refresh_token: refresh }).catch(() => undefined);
+  }
+}
+
 export function clearTokens() {
   if (typeof window !== "undefined") {
     localStorage.removeItem("access_token");
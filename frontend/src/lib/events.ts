@@ -0,0 +1,63 @@
+import { API_BASE } from "@/lib/api";
+
+export type GroupEvent = { event: string; data: Record<string, unknown> };
+
+const RETRY_MS = 5_000;
+
+/** Parse complete SSE messages out of `buffer`; returns the unparsed rest. */
+function parseMessages(buffer: string, emit: (e: GroupEvent) => void): string {
+  const parts = buffer.split("\n\n");
+  const rest = parts.pop() ?? "";
+  for (const part of parts) {
+    let event = "message";
+    const data: string[] = [];
+    for (const line of part.split("\n")) {
+      if (line.startsWith("event: ")) event = line.slice(7);
+      else if (line.startsWith("data: ")) data.push(line.slice(6));
+    }
+    // Comment-only messages are keepalive pings
+    if (data.length > 0) emit({ event, data: JSON.parse(data.join("\n")) });
+  }
+  return rest;
+}
+
+/**
+ * Follow /groups/{id}/events, reconnecting after errors, until `signal` aborts.
+ * Uses fetch rather than EventSource, which cannot send the Authorization header.
+ * `onOpen` and `onClose` report whether the stream is live; after a reconnect or
+ * a `resync` event, callers catch up through /changes.
+ */
+export async function followGroupEvents(
+  groupId: string,
+  onEvent: (e: GroupEvent) => void,
+  signal: AbortSignal,
+  onOpen?: () => void,
+  onClose?: () => void
+): Promise<void> {
+  while (!signal.aborted) {
+    try {
+      const token = localStorage.getItem("access_token");
+      const res = await fetch(`${API_BASE}/groups/${groupId}/events`, {
+        headers: { Accept: "text/event-stream", ...(token ? { Authorization: `Bearer ${token}` } : {}) },
+        signal,
+      });
+      // Membership lost; anything else (401 before a token refresh, 503 at capacity) is retried
+      if (res.status === 403 || res.status === 404) return;
+      if (res.ok && res.body) {
+        onOpen?.();
+        const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer = parseMessages(buffer + value, onEvent);
+        }
+      }
+    } catch {
+      // Network error or abort
+    }
+    onClose?.();
+    if (signal.aborted) return;
+    await new Promise((resolve) => setTimeout(resolve, RETRY_MS));
+  }
+}
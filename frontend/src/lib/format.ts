@@ -0,0 +1,9 @@
+/** Format an amount in an ISO 4217 currency, e.g. formatMoney(12.3, "EUR") -> "€12.30".
+ * `compact` abbreviates large amounts for chart axes, e.g. "€1.2K". */
+export function formatMoney(amount: number, currency: string, compact = false): string {
+  return new Intl.NumberFormat(undefined, {
+    style: "currency",
+    currency,
+    ...(compact ? { notation: "compact", maximumFractionDigits: 1 } : {}),
+  }).format(amount);
+}
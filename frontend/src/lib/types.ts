@@ -12,6 +12,7 @@ export interface Group {
   created_by: string;
   members: { user_id: string; role: string; full_name?: string | null }[];
   custom_categories: string[];
+  base_currency: string;
   created_at?: string;
 }
 
@@ -19,6 +20,7 @@ export interface Expense {
   id: string;
   title: string;
   amount: number;
+  currency: string;
   category: string;
   description: string;
   date: string;
@@ -27,9 +29,36 @@ export interface Expense {
   created_at?: string;
 }
 
+export interface ExpensePage {
+  items: Expense[];
+  limit: number;
+  next_cursor: string | null;
+  /** Pass as `since` to /changes to follow later changes. */
+  sync_token: string;
+  total?: number;
+  page?: number;
+  pages?: number;
+}
+
+/** GET /groups/{id}/changes: expenses created or modified since a token (at-least-once). */
+export interface ChangesPage {
+  items: Expense[];
+  next: string;
+  has_more: boolean;
+}
+
 export interface Stats {
   total: number;
+  currency: string;
   by_category: { category: string; total: number }[];
   by_user: { user_id: string; total: number; full_name?: string | null }[];
   monthly: { year: number; month: number; total: number }[];
 }
+
+/** GET /groups/{id}/overview; only the parts requested via `fields` are present. */
+export interface GroupOverview {
+  group?: Group;
+  categories?: string[];
+  expenses?: ExpensePage;
+  stats?: Stats & { year: number; month: number };
+}